@@ -0,0 +1,70 @@
+"""
+Compara o tamanho e o tempo de construção do modelo CP-SAT entre as
+codificações de dia "table" (original) e "channel".
+
+Uso (na raiz do projeto):
+    python -m benchmarks.day_encoding
+"""
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from src.data_loader import DataLoader
+from src.scheduler import DAY_ENCODINGS, Scheduler
+
+DADOS = Path(__file__).parent.parent / "dados"
+
+
+def _calendario_sintetico(base: Path, n_dias: int) -> Path:
+    """
+    Copia os JSONs de 'dados/' para um diretório temporário, estendendo
+    Dias.json (repetindo o calendário original) até n_dias.
+    """
+    destino = Path(tempfile.mkdtemp(prefix="exam_scheduler_"))
+    for arq in base.glob("*.json"):
+        shutil.copy(arq, destino / arq.name)
+
+    dias = json.loads((base / "Dias.json").read_text(encoding="utf-8"))
+    estendido = [dias[i % len(dias)] for i in range(n_dias)]
+    (destino / "Dias.json").write_text(json.dumps(estendido), encoding="utf-8")
+    return destino
+
+
+def medir(base_path: Path, day_encoding: str) -> dict:
+    loader = DataLoader(base_path, snapshots=None)
+    inicio = time.perf_counter()
+    sched = Scheduler(
+        schedules=loader.schedules,
+        subjects_by_course=loader.subjects_by_course,
+        subjects_by_student=loader.subjects_by_student,
+        courses_by_subject=loader.courses_by_subject,
+        free_slots=loader.free_slots,
+        daily_slot_ranges=loader.daily_slot_ranges,
+        slots_per_day=loader.slots_per_day,
+        total_slots=loader.total_slots,
+        day_encoding=day_encoding,
+        solve=False,
+    )
+    build_s = time.perf_counter() - inicio
+    return {"dias": len(loader.days), "build_s": round(build_s, 4), **sched.model_stats()}
+
+
+def main():
+    sintetico = _calendario_sintetico(DADOS, 40)
+    try:
+        for nome, base in (("real", DADOS), ("sintetico_40d", sintetico)):
+            for enc in DAY_ENCODINGS:
+                r = medir(base, enc)
+                print(
+                    f"{nome:>14} {enc:>8}: dias={r['dias']:>3} "
+                    f"vars={r['variables']:>6} restr={r['constraints']:>6} "
+                    f"tuplas={r['tuples']:>8} build={r['build_s']:.3f}s"
+                )
+    finally:
+        shutil.rmtree(sintetico, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
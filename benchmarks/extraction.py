@@ -0,0 +1,102 @@
+"""
+Compara a extração de planilhas de recuperação em modo completo (caminho
+antigo: load_workbook + ws["A1"] célula a célula) com o modo streaming de
+recovery_utils.extract, numa planilha sintética de 5.000 linhas × 60
+colunas. Cada caminho roda em um subprocesso para medir o pico de RSS.
+
+Uso (na raiz do projeto, Linux/macOS):
+    python -m benchmarks.extraction
+"""
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import openpyxl
+from openpyxl.utils import get_column_letter
+
+from src.recovery_utils import extract, process_str
+
+
+def extract_full(filepath: str, headers: str, firstRow: int, lastRow: int) -> List[List[str]]:
+    # Implementação anterior, mantida apenas como referência de comparação
+    wb = openpyxl.load_workbook(Path(filepath), data_only=True)
+    ws = wb.active
+    cols = [h.strip() for h in headers.split(",") if h.strip()]
+    header_map: Dict[str, str] = {col: process_str(ws[f"{col}1"].value) for col in cols}
+    results: List[List[str]] = []
+    for i in range(firstRow, lastRow + 1):
+        subjects: List[str] = []
+        for col in cols:
+            raw = ws[f"{col}{i}"].value
+            score = float(raw) if isinstance(raw, (int, float)) else 0.0
+            if score < 6.0:
+                subjects.append(header_map[col])
+        if subjects:
+            results.append(subjects)
+    return results
+
+
+PATHS = {"full": extract_full, "streaming": extract}
+
+
+def generate_sheet(path: Path, rows: int = 5000, cols: int = 60, seed: int = 0) -> str:
+    """
+    Gera a planilha sintética e retorna os cabeçalhos a extrair (uma
+    coluna de nota a cada 4, como nas planilhas reais).
+    """
+    rng = random.Random(seed)
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append([f"Disciplina {c}" for c in range(1, cols + 1)])
+    for _ in range(rows):
+        ws.append([round(rng.uniform(0, 10), 1) for _ in range(cols)])
+    wb.save(path)
+    return ",".join(get_column_letter(c) for c in range(2, cols + 1, 4))
+
+
+def _run_child(modo: str, arquivo: str, headers: str, rows: int):
+    inicio = time.perf_counter()
+    resultado = PATHS[modo](arquivo, headers, 2, rows + 1)
+    segundos = time.perf_counter() - inicio
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        rss //= 1024  # macOS reporta em bytes
+    print(json.dumps({"seconds": segundos, "peak_rss_kb": rss, "students": len(resultado)}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--cols", type=int, default=60)
+    parser.add_argument("--child", nargs=3, metavar=("MODO", "ARQUIVO", "HEADERS"))
+    args = parser.parse_args()
+
+    if args.child:
+        _run_child(*args.child, args.rows)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        arquivo = Path(tmp) / "notas.xlsx"
+        headers = generate_sheet(arquivo, args.rows, args.cols)
+        for modo in PATHS:
+            saida = subprocess.run(
+                [sys.executable, "-m", "benchmarks.extraction", "--rows", str(args.rows),
+                 "--child", modo, str(arquivo), headers],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            r = json.loads(saida)
+            print(
+                f"{modo:>9}: {r['seconds']:.2f}s  pico RSS {r['peak_rss_kb'] / 1024:.1f} MB  "
+                f"alunos={r['students']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Benchmark reprodutível do pipeline: gera uma escola sintética, mede
+separadamente carga (DataLoader), construção do modelo, busca (CP-SAT) e
+exportação (ExcelExporter), e grava os resultados em JSON para comparar
+entre commits.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.run --scenario medium --out bench.json
+    python -m benchmarks.run --scenario medium --baseline bench.json --threshold 0.25
+
+Com --baseline, sai com código 1 se alguma fase ficar mais de
+'threshold' (fração) mais lenta, ou se o objetivo piorar. Sempre sai com
+código 1 se o modo decompose falhar ou divergir do modelo único.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from benchmarks.synthetic import generate_school
+from src.data_loader import DataLoader
+from src.excel_exporter import ExcelExporter
+from src.scheduler import Scheduler
+from src.solver_profile import PRESETS, SolverProfile
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "small": dict(courses=3, students=30, failure_rate=0.10, days=11, slots_per_day=8),
+    "medium": dict(courses=10, students=60, failure_rate=0.15, days=11, slots_per_day=8),
+    "large": dict(courses=30, students=200, failure_rate=0.08, days=20, slots_per_day=8),
+    # várias componentes pequenas: algumas fecham pela solução gulosa no
+    # limite inferior global e nem montam modelo (modo decompose)
+    "fragmented": dict(courses=5, students=40, failure_rate=0.15, days=11, slots_per_day=8),
+}
+
+# Tempos abaixo deste piso (s) não entram na checagem de regressão: ruído
+MIN_TIMING = 0.05
+
+
+@contextmanager
+def _chdir(path: Path):
+    anterior = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(anterior)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(params: Dict[str, Any], profile: SolverProfile, seed: int = 0) -> Dict[str, Any]:
+    timings: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory(prefix="exam_bench_") as tmp:
+        base = generate_school(Path(tmp) / "dados", seed=seed, **params)
+
+        inicio = time.perf_counter()
+        # sem snapshot: mede o parse e a derivação completos
+        loader = DataLoader(base, snapshots=None)
+        timings["load"] = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        sched = Scheduler(
+            schedules=loader.schedules,
+            subjects_by_course=loader.subjects_by_course,
+            subjects_by_student=loader.subjects_by_student,
+            courses_by_subject=loader.courses_by_subject,
+            free_slots=loader.free_slots,
+            daily_slot_ranges=loader.daily_slot_ranges,
+            slots_per_day=loader.slots_per_day,
+            total_slots=loader.total_slots,
+            student_profiles=loader.student_profiles,
+            profile=profile,
+            solve=False,
+        )
+        timings["build"] = time.perf_counter() - inicio
+        model = sched.model_stats()
+
+        inicio = time.perf_counter()
+        try:
+            exam_schedule = sched.solve()
+        except RuntimeError:
+            # sem solução no tempo do perfil: registra o status e segue
+            exam_schedule = None
+        timings["solve"] = time.perf_counter() - inicio
+
+        # Mesmo problema pelo caminho do pipeline (componentes separadas)
+        inicio = time.perf_counter()
+        try:
+            decomposto = Scheduler(
+                schedules=loader.schedules,
+                subjects_by_course=loader.subjects_by_course,
+                subjects_by_student=loader.subjects_by_student,
+                courses_by_subject=loader.courses_by_subject,
+                free_slots=loader.free_slots,
+                daily_slot_ranges=loader.daily_slot_ranges,
+                slots_per_day=loader.slots_per_day,
+                total_slots=loader.total_slots,
+                student_profiles=loader.student_profiles,
+                decompose=True,
+                max_workers=1,
+                profile=profile,
+            ).solve_report
+        except RuntimeError:
+            decomposto = {"status": "UNKNOWN", "objective": None}
+        timings["solve_decomposed"] = time.perf_counter() - inicio
+
+        if exam_schedule is not None:
+            inicio = time.perf_counter()
+            with _chdir(Path(tmp)):
+                ExcelExporter(
+                    schedules=loader.schedules,
+                    days=loader.days,
+                    exam_schedule=exam_schedule,
+                    class_exam_by_slot=loader.class_exam_by_slot,
+                    slots_per_day=loader.slots_per_day,
+                )
+            timings["export"] = time.perf_counter() - inicio
+
+    return {
+        "params": {**params, "seed": seed},
+        "exams": sum(len(s) for s in loader.subjects_by_course.values()),
+        "students": len(loader.subjects_by_student),
+        "timings": {fase: round(t, 4) for fase, t in timings.items()},
+        "model": model,
+        "status": sched.solve_report["status"],
+        "objective": sched.solve_report.get("objective"),
+        "bound": sched.solve_report["bound"],
+        "proof": sched.solve_report.get("proof"),
+        "decomposed": {
+            "status": decomposto["status"],
+            "objective": decomposto.get("objective"),
+        },
+    }
+
+
+def check_regressions(
+    atual: Dict[str, Any], baseline: Dict[str, Any], threshold: float,
+) -> List[str]:
+    """
+    Compara os resultados por cenário e retorna as regressões encontradas.
+    """
+    problemas = check_decomposition(atual)
+    for nome, res in atual["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(nome)
+        if base is None:
+            continue
+        for fase, t in res["timings"].items():
+            t_base = base["timings"].get(fase)
+            if t_base is None or max(t, t_base) < MIN_TIMING:
+                continue
+            if t > t_base * (1 + threshold):
+                problemas.append(f"{nome}/{fase}: {t_base:.3f}s → {t:.3f}s")
+        if res["objective"] is None and base["objective"] is not None:
+            problemas.append(f"{nome}/objective: {base['objective']:.0f} → sem solução")
+        elif res["objective"] is not None and base["objective"] is not None:
+            if res["objective"] > base["objective"]:
+                problemas.append(
+                    f"{nome}/objective: {base['objective']:.0f} → {res['objective']:.0f}"
+                )
+    return problemas
+
+
+def check_decomposition(atual: Dict[str, Any]) -> List[str]:
+    """
+    O modo decompose (usado pelo pipeline) deve chegar ao mesmo ótimo do
+    modelo único quando os dois provam otimalidade.
+    """
+    problemas = []
+    for nome, res in atual["scenarios"].items():
+        dec = res.get("decomposed")
+        if dec is None:
+            continue
+        if dec["objective"] is None and res["objective"] is not None:
+            problemas.append(f"{nome}/decompose: sem solução")
+        elif (
+            res["status"] == dec["status"] == "OPTIMAL"
+            and res["objective"] != dec["objective"]
+        ):
+            problemas.append(
+                f"{nome}/decompose: {res['objective']:.0f} → {dec['objective']:.0f}"
+            )
+    return problemas
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark do Exam Scheduler")
+    parser.add_argument("--scenario", choices=list(SCENARIOS), action="append")
+    parser.add_argument("--perfil", choices=list(PRESETS), default="fast")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, help="arquivo JSON de saída")
+    parser.add_argument("--baseline", type=Path, help="JSON de uma execução anterior")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    profile = SolverProfile.preset(args.perfil)
+    resultados = {
+        "commit": _git_commit(),
+        "profile": args.perfil,
+        "scenarios": {},
+    }
+    for nome in args.scenario or ["small", "medium", "fragmented"]:
+        res = run_benchmark(SCENARIOS[nome], profile, seed=args.seed)
+        resultados["scenarios"][nome] = res
+        t = res["timings"]
+        print(
+            f"{nome:>7}: exames={res['exams']} load={t['load']:.3f}s "
+            f"build={t['build']:.3f}s solve={t['solve']:.3f}s "
+            f"export={t.get('export', 0.0):.3f}s vars={res['model']['variables']} "
+            f"restr={res['model']['constraints']} obj={res['objective']} ({res['status']})"
+        )
+
+    if args.out:
+        args.out.write_text(json.dumps(resultados, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        problemas = check_regressions(resultados, baseline, args.threshold)
+    else:
+        problemas = check_decomposition(resultados)
+    for p in problemas:
+        print(f"REGRESSÃO {p}")
+    return 1 if problemas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""
+Compara a carga do DataLoader a partir dos JSONs (parse + derivação) com
+a carga a partir do snapshot binário mapeado em memória, numa escola
+sintética grande (padrão: 40 cursos × 500 alunos).
+
+Uso (na raiz do projeto):
+    python -m benchmarks.snapshot --courses 40 --students 500
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import generate_school
+from src.data_loader import DataLoader
+from src.snapshot import SnapshotCache
+
+
+def _melhor(repeat: int, **kwargs) -> float:
+    tempos = []
+    for _ in range(repeat):
+        inicio = time.perf_counter()
+        DataLoader(**kwargs)
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--courses", type=int, default=40)
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = generate_school(
+            Path(tmp) / "dados", courses=args.courses, students=args.students,
+            subjects_per_course=20, seed=1,
+        )
+        snapshots = SnapshotCache(Path(tmp) / "snapshots", max_entries=1)
+
+        json_s = _melhor(args.repeat, base_path=base, snapshots=None)
+        inicio = time.perf_counter()
+        loader = DataLoader(base, snapshots=snapshots)
+        gravacao = time.perf_counter() - inicio
+        snap_s = _melhor(args.repeat, base_path=base, snapshots=snapshots)
+        tamanho = sum(p.stat().st_size for p in snapshots.cache_dir.glob("*.bin"))
+
+    print(f"alunos={len(loader.subjects_by_student)}  snapshot={tamanho / 1024:.0f} KB")
+    print(f"     JSON: {json_s * 1000:8.1f} ms")
+    print(f" gravação: {gravacao * 1000:8.1f} ms (primeira carga: JSON + snapshot)")
+    print(f" snapshot: {snap_s * 1000:8.1f} ms  ({json_s / snap_s:.1f}×)")
+
+
+if __name__ == "__main__":
+    main()
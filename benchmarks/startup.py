@@ -0,0 +1,71 @@
+"""
+Mede o tempo de importação de cada ponto de entrada do app, cada um num
+interpretador novo (sem cache de módulos), e lista quais dependências
+pesadas foram carregadas no caminho. Na CLI mede também a montagem do
+parser, que roda em todo subcomando.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.startup --repeat 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+HEAVY_MODULES = ("ortools", "flet", "openpyxl", "numpy", "xlsxwriter")
+
+# rótulo → (módulo, código executado depois do import sobre 'modulo')
+ENTRY_POINTS: Dict[str, Tuple[str, str]] = {
+    "menu (src.app)": ("src.app", ""),
+    "opção 1 (extrator)": ("src.gui_recovery_extractor", ""),
+    "opção 2 (GUI agendador)": ("src.gui_scheduler", ""),
+    "opção 3 (pipeline)": ("src.pipeline", ""),
+    "cli (build_parser)": ("src.cli", "modulo.build_parser()"),
+}
+
+_CHILD = """
+import importlib, json, sys, time
+inicio = time.perf_counter()
+modulo = importlib.import_module({module!r})
+{call}
+segundos = time.perf_counter() - inicio
+pesados = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": segundos, "heavy": pesados}}))
+"""
+
+
+def measure(module: str, call: str, repeat: int) -> Dict:
+    tempos: List[float] = []
+    pesados: List[str] = []
+    for _ in range(repeat):
+        saida = subprocess.run(
+            [sys.executable, "-c", _CHILD.format(module=module, call=call, heavy=HEAVY_MODULES)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        r = json.loads(saida)
+        tempos.append(r["seconds"])
+        pesados = r["heavy"]
+    return {"median": statistics.median(tempos), "min": min(tempos), "heavy": pesados}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for rotulo, (module, call) in ENTRY_POINTS.items():
+        try:
+            r = measure(module, call, args.repeat)
+        except subprocess.CalledProcessError as e:
+            print(f"{rotulo:>24}: falhou ({e.stderr.strip().splitlines()[-1]})")
+            continue
+        print(
+            f"{rotulo:>24}: mediana {r['median'] * 1000:7.1f} ms  mín {r['min'] * 1000:7.1f} ms  "
+            f"carrega: {', '.join(r['heavy']) or '-'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Gerador de escolas sintéticas no formato dos JSONs de 'dados/'
+(Horarios.json, AlunosEmRecuperacao.json, Dias.json, ExamesEmAula.json).
+A geração é determinística para uma mesma semente.
+"""
+import json
+import random
+from pathlib import Path
+from typing import Dict, List
+
+WEEKDAYS = ["seg", "ter", "qua", "qui", "sex"]
+
+
+def generate_school(
+    out_dir: Path,
+    courses: int = 5,
+    students: int = 30,
+    failure_rate: float = 0.15,
+    days: int = 11,
+    slots_per_day: int = 8,
+    subjects_per_course: int = 15,
+    shared_subjects: int = 8,
+    free_rate: float = 0.35,
+    seed: int = 0,
+) -> Path:
+    """
+    Gera uma escola sintética em out_dir:
+    - cada curso tem subjects_per_course disciplinas, das quais
+      shared_subjects são comuns a todos os cursos (sincronizadas);
+    - cada slot da grade semanal é um horário livre comum à escola com
+      probabilidade free_rate (o que mantém viável a sincronização das
+      disciplinas comuns); os demais ficam livres por curso com
+      probabilidade free_rate / 2;
+    - cada aluno reprova em cada disciplina com probabilidade failure_rate;
+    - um exame em aula por curso, em um slot ocupado pela disciplina.
+    """
+    rng = random.Random(seed)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    comuns = [f"comum_{i}" for i in range(shared_subjects)]
+    livre_comum = {
+        dia: [rng.random() < free_rate for _ in range(slots_per_day)]
+        for dia in WEEKDAYS
+    }
+    horarios: Dict[str, Dict[str, List]] = {}
+    recuperacao: Dict[str, Dict[str, List[str]]] = {}
+    exames_em_aula: Dict[str, Dict[str, List[int]]] = {}
+
+    for c in range(courses):
+        curso = f"curso_{c}"
+        disciplinas = comuns + [
+            f"{curso}_disc_{i}" for i in range(subjects_per_course - shared_subjects)
+        ]
+
+        grade = {
+            dia: [
+                0 if livre_comum[dia][per] or rng.random() < free_rate / 2
+                else rng.choice(disciplinas)
+                for per in range(slots_per_day)
+            ]
+            for dia in WEEKDAYS
+        }
+        horarios[curso] = grade
+
+        alunos = {}
+        for a in range(students):
+            reprovadas = [d for d in disciplinas if rng.random() < failure_rate]
+            if reprovadas:
+                alunos[str(a)] = reprovadas
+        recuperacao[curso] = alunos
+
+        ocupados = [
+            (dia_idx * slots_per_day + per, grade[WEEKDAYS[dia_idx % 5]][per])
+            for dia_idx in range(days)
+            for per in range(slots_per_day)
+            if grade[WEEKDAYS[dia_idx % 5]][per] != 0
+        ]
+        if ocupados:
+            slot, disc = rng.choice(ocupados)
+            exames_em_aula[curso] = {disc: [slot]}
+
+    calendario = [WEEKDAYS[i % 5] for i in range(days)]
+    for nome, data in (
+        ("Horarios.json", horarios),
+        ("AlunosEmRecuperacao.json", recuperacao),
+        ("Dias.json", calendario),
+        ("ExamesEmAula.json", exames_em_aula),
+    ):
+        (out_dir / nome).write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return out_dir
@@ -1,45 +1,47 @@
-from pathlib import Path
+import argparse
+from typing import List, Optional
 
-from src.data_loader import DataLoader
-from src.scheduler import Scheduler
-from src.excel_exporter import ExcelExporter
-from src.gui_recovery_extractor import GUIRecoveryExtractor
-from src.gui_scheduler import GUIScheduler
+from src.cli import STUDENT_FORMATS, add_solver_arguments, profile_from_args
 
+# Cada opção do menu importa só o que usa: flet (GUIs) e ortools/xlsxwriter
+# (agendamento) levam segundos para carregar. Ver benchmarks/startup.py.
 
-def run_scheduling():
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     """
-    Carrega todos os JSONs de 'dados/' → monta o modelo CP-SAT →
-    gera as planilhas em 'planilhas/'.
+    Lê as opções de agendamento da linha de comando, ex.:
+        python src/app.py --perfil fast --workers 8 --tempo 5
     """
-    base_path = Path(__file__).parent.parent / "dados"
-    loader = DataLoader(base_path)
-
-    sched = Scheduler(
-        schedules=loader.schedules,
-        subjects_by_course=loader.subjects_by_course,
-        subjects_by_student=loader.subjects_by_student,
-        courses_by_subject=loader.courses_by_subject,
-        free_slots=loader.free_slots,
-        daily_slot_ranges=loader.daily_slot_ranges,
-        slots_per_day=loader.slots_per_day,
-        total_slots=loader.total_slots,
+    parser = argparse.ArgumentParser(description="Exam Scheduler")
+    add_solver_arguments(parser)
+    parser.add_argument(
+        "--limpar-cache", action="store_true",
+        help="remove todos os agendamentos e snapshots de dados em cache antes de executar",
     )
-
-    exam_schedule = sched.get_exam_schedule()
-
-    ExcelExporter(
-        schedules=loader.schedules,
-        days=loader.days,
-        exam_schedule=exam_schedule,
-        exams_in_class=loader.exams_in_class,
-        slots_per_day=loader.slots_per_day,
+    parser.add_argument(
+        "--consolidado", action="store_true",
+        help="na opção 3, grava também TodosOsCursos.xlsx, com uma aba por curso",
     )
-
-    print("⏳ Planilhas de horário geradas em 'planilhas/' com sucesso.")
+    parser.add_argument(
+        "--alunos", choices=STUDENT_FORMATS,
+        help="na opção 3, grava também o cronograma de provas de cada aluno",
+    )
+    return parser.parse_args(argv)
 
 
 def main():
+    args = parse_args()
+    if args.limpar_cache:
+        from src.snapshot import SNAPSHOT_CACHE
+        from src.solution_cache import CACHE_DIR, SolutionCache
+
+        removidas = SolutionCache(CACHE_DIR).clear()
+        snapshots = SNAPSHOT_CACHE.clear()
+        print(
+            f"Cache limpo: {removidas} agendamento(s) e {snapshots} snapshot(s) "
+            "removido(s)."
+        )
+
     print("==============================================")
     print("  1 → Construir AlunosEmRecuperacao.json (GUI)")
     print("  2 → Agendar Exames em Sala (GUI)")
@@ -48,16 +50,31 @@ def main():
     choice = input("Digite 1, 2 ou 3 e pressione Enter: ").strip()
 
     if choice == "1":
+        from src.gui_recovery_extractor import GUIRecoveryExtractor
+
         gui_recovery = GUIRecoveryExtractor()
         gui_recovery.run()
     elif choice == "2":
+        from src.gui_scheduler import GUIScheduler
+
         gui_scheduler = GUIScheduler()
         gui_scheduler.run()
     elif choice == "3":
-        run_scheduling()
+        from src.pipeline import run_scheduling
+
+        run_scheduling(
+            profile_from_args(args),
+            warm_start=not args.sem_warm_start,
+            fix_unchanged=args.fixar_inalterados,
+            use_cache=not args.sem_cache,
+            trace_file=args.trace,
+            trace_summary=args.resumo,
+            consolidated=args.consolidado,
+            student_format=args.alunos,
+        )
     else:
         print("Opção inválida. Rode novamente e digite '1', '2' ou '3'.")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,73 @@
+from typing import Dict, FrozenSet, List, Set, Tuple
+
+from src.conflict_graph import sync_classes
+from src.encoding import mask_to_slots, slots_to_mask
+
+
+def latest_slot_bounds(
+    schedules: Dict[str, Dict[str, List[int]]],
+    subjects_by_course: Dict[str, Set[str]],
+    courses_by_subject: Dict[str, List[str]],
+    free_slots: Dict[str, List[int]],
+    student_profiles: Dict[str, List[FrozenSet[str]]],
+    slots_per_day: int,
+    max_per_day: int = 3,
+) -> Dict[str, int]:
+    """
+    Limites inferiores baratos para latest_slot, calculados antes do modelo:
+    - "exam": nenhum exame cabe antes do primeiro slot livre do seu grupo
+      sincronizado (interseção dos slots livres dos cursos);
+    - "clique": as k disciplinas de um perfil de aluno precisam de k slots
+      distintos, no máximo max_per_day por dia, dentro da união dos
+      domínios delas; o k-ésimo slot escolhido do mais cedo para o mais
+      tarde limita o último slot usado.
+
+    Grupos sem slot possível (modelo inviável) são ignorados: o CP-SAT é
+    quem reporta a inviabilidade.
+    """
+    exames = [
+        (curso, subj)
+        for curso in schedules
+        for subj in sorted(subjects_by_course.get(curso, []))
+    ]
+    masks = {c: slots_to_mask(s) for c, s in free_slots.items()}
+
+    dominio: Dict[Tuple[str, str], int] = {}
+    for membros, mask in sync_classes(exames, courses_by_subject, masks):
+        for exame in membros:
+            dominio[exame] = mask
+
+    exam = max(
+        ((m & -m).bit_length() - 1 for m in dominio.values() if m),
+        default=0,
+    )
+
+    clique = 0
+    vistos: Dict[Tuple[int, int], int] = {}  # (união dos domínios, k) → limite
+    for curso, perfis in student_profiles.items():
+        for perfil in perfis:
+            uniao = 0
+            for subj in perfil:
+                uniao |= dominio[(curso, subj)]
+            chave = (uniao, len(perfil))
+            if chave not in vistos:
+                vistos[chave] = _kth_slot(uniao, len(perfil), slots_per_day, max_per_day)
+            clique = max(clique, vistos[chave])
+
+    return {"exam": exam, "clique": clique}
+
+
+def _kth_slot(mask: int, k: int, slots_per_day: int, max_per_day: int) -> int:
+    # k-ésimo slot de 'mask' escolhendo sempre o mais cedo, com no máximo
+    # max_per_day por dia; 0 se não couberem k slots (inviável)
+    por_dia: Dict[int, int] = {}
+    escolhidos = 0
+    for slot in mask_to_slots(mask):
+        dia = slot // slots_per_day
+        if por_dia.get(dia, 0) == max_per_day:
+            continue
+        por_dia[dia] = por_dia.get(dia, 0) + 1
+        escolhidos += 1
+        if escolhidos == k:
+            return slot
+    return 0
@@ -0,0 +1,246 @@
+"""
+Linha de comando não interativa do pipeline extração → agendamento →
+exportação, para uso em servidores e cron (sem GUI, sem importar flet).
+
+    python -m src.cli extract notas/*.xlsx --dados dados
+    python -m src.cli schedule --dados dados --perfil fast
+    python -m src.cli export --dados dados --planilhas planilhas
+    python -m src.cli all notas/*.xlsx --dados dados --planilhas planilhas
+
+Códigos de saída: 0 sucesso, 1 nenhuma solução viável, 2 erro nos
+argumentos ou nos arquivos de entrada.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from src.solver_profile import ENGINES, PRESETS, SEARCH_STRATEGIES, SolverProfile
+
+# Repetido de src.student_exporter para não importar xlsxwriter no parser
+STUDENT_FORMATS = ("xlsx", "csv", "json")
+# Repetidos de src.recovery_utils para não importar openpyxl no parser
+DEFAULT_HEADERS = "F,J,N,R,V,Z,AD,AH,AL,AP,AT,AX,BB,BF,BJ"
+DEFAULT_FIRST_ROW = 3
+DEFAULT_LAST_ROW = 39
+
+EXIT_OK = 0
+EXIT_NO_SOLUTION = 1
+EXIT_INPUT_ERROR = 2
+
+DEFAULT_DATA_DIR = Path(__file__).parent.parent / "dados"
+
+
+def add_solver_arguments(parser: argparse.ArgumentParser):
+    """
+    Opções de agendamento compartilhadas pelo menu (app.py) e pela CLI.
+    """
+    parser.add_argument("--perfil", choices=list(PRESETS), default="balanced")
+    parser.add_argument("--workers", type=int, help="threads do CP-SAT (0 = todos os núcleos)")
+    parser.add_argument("--tempo", type=float, help="tempo máximo de busca em segundos")
+    parser.add_argument("--gap", type=float, help="gap relativo para parar a busca")
+    parser.add_argument("--estrategia", choices=SEARCH_STRATEGIES, help="estratégia de busca")
+    parser.add_argument(
+        "--motor", choices=ENGINES,
+        help="cpsat (padrão) ou greedy (heurística instantânea, sem CP-SAT)",
+    )
+    parser.add_argument(
+        "--horizonte", action="store_true",
+        help="resolve primeiro com poucos dias de prova e amplia se for inviável",
+    )
+    parser.add_argument(
+        "--sem-warm-start", action="store_true",
+        help="ignora o agendamento salvo da última execução",
+    )
+    parser.add_argument(
+        "--fixar-inalterados", action="store_true",
+        help="mantém no mesmo slot os exames cujos alunos não mudaram",
+    )
+    parser.add_argument(
+        "--sem-cache", action="store_true",
+        help="resolve o modelo mesmo que haja um agendamento em cache",
+    )
+    parser.add_argument(
+        "--trace", type=Path,
+        help="grava fases, contadores e log do CP-SAT neste arquivo (JSON lines)",
+    )
+    parser.add_argument(
+        "--resumo", action="store_true",
+        help="imprime um resumo de tempos, contadores e memória ao final",
+    )
+
+
+def profile_from_args(args: argparse.Namespace) -> SolverProfile:
+    overrides = {
+        campo: valor
+        for campo, valor in (
+            ("num_workers", args.workers),
+            ("max_time_in_seconds", args.tempo),
+            ("relative_gap_limit", args.gap),
+            ("search_strategy", args.estrategia),
+            ("engine", args.motor),
+            ("horizon_search", args.horizonte or None),
+        )
+        if valor is not None
+    }
+    return SolverProfile.preset(args.perfil, **overrides)
+
+
+def _add_extract_arguments(parser: argparse.ArgumentParser, required: bool):
+    parser.add_argument(
+        "arquivos", nargs="+" if required else "*", type=Path,
+        help="planilhas .xlsx de notas" + ("" if required else " (omitir pula a extração)"),
+    )
+    parser.add_argument("--cabecalhos", default=DEFAULT_HEADERS, help="colunas de nota, ex.: F,J,N")
+    parser.add_argument("--linha-inicial", type=int, default=DEFAULT_FIRST_ROW)
+    parser.add_argument("--linha-final", type=int, default=DEFAULT_LAST_ROW)
+    parser.add_argument("--processos", type=int, help="processos para extração em paralelo")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli",
+        description="Exam Scheduler — pipeline em lote (sem GUI)",
+    )
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    def _dados(p: argparse.ArgumentParser):
+        p.add_argument(
+            "--dados", type=Path, default=DEFAULT_DATA_DIR,
+            help="diretório com os JSONs de entrada (padrão: dados/)",
+        )
+
+    def _planilhas(p: argparse.ArgumentParser):
+        p.add_argument(
+            "--planilhas", type=Path, default=Path("planilhas"),
+            help="diretório de saída das planilhas .xlsx (padrão: planilhas/)",
+        )
+        p.add_argument(
+            "--consolidado", action="store_true",
+            help="grava também TodosOsCursos.xlsx, com uma aba por curso",
+        )
+        p.add_argument(
+            "--alunos", choices=STUDENT_FORMATS,
+            help="grava também o cronograma de provas de cada aluno (ProvasPorAluno.<formato>)",
+        )
+
+    p_extract = sub.add_parser("extract", help="planilhas de notas → AlunosEmRecuperacao.json")
+    _add_extract_arguments(p_extract, required=True)
+    _dados(p_extract)
+
+    p_schedule = sub.add_parser("schedule", help="resolve o agendamento (CP-SAT)")
+    _dados(p_schedule)
+    add_solver_arguments(p_schedule)
+
+    p_export = sub.add_parser("export", help="gera as planilhas a partir do último agendamento")
+    _dados(p_export)
+    _planilhas(p_export)
+    p_export.add_argument(
+        "--agendamento", type=Path,
+        help="JSON do agendamento (padrão: <dados>/UltimoAgendamento.json)",
+    )
+
+    p_all = sub.add_parser("all", help="extract → schedule → export")
+    _add_extract_arguments(p_all, required=False)
+    _dados(p_all)
+    _planilhas(p_all)
+    add_solver_arguments(p_all)
+
+    return parser
+
+
+def _extract(args: argparse.Namespace):
+    from src.pipeline import extract_recovery
+
+    jobs = [
+        (str(arquivo), args.cabecalhos, args.linha_inicial, args.linha_final)
+        for arquivo in args.arquivos
+    ]
+    destino = args.dados / "AlunosEmRecuperacao.json"
+    merged = extract_recovery(jobs, destino, max_workers=args.processos)
+    alunos = sum(len(v) for v in merged.values())
+    print(f"{len(jobs)} planilha(s) → {alunos} aluno(s) em recuperação em '{destino}'.")
+
+
+def _schedule(
+    args: argparse.Namespace, profile: SolverProfile, output_dir: Optional[Path] = None,
+):
+    from src.data_loader import DataLoader
+    from src.instrumentation import NULL_TRACER, Tracer
+    from src.pipeline import export_schedules, export_student_timetables, schedule_exams
+
+    tracer = Tracer(args.trace) if args.trace or args.resumo else NULL_TRACER
+    try:
+        with tracer.phase("load"):
+            loader = DataLoader(args.dados, tracer=tracer)
+        exam_schedule = schedule_exams(
+            loader,
+            profile,
+            warm_start=not args.sem_warm_start,
+            fix_unchanged=args.fixar_inalterados,
+            use_cache=not args.sem_cache,
+            tracer=tracer,
+        )
+        if output_dir is not None:
+            export_schedules(loader, exam_schedule, output_dir, tracer, args.consolidado)
+            if args.alunos:
+                export_student_timetables(loader, exam_schedule, output_dir, args.alunos, tracer)
+            print(f"Planilhas geradas em '{output_dir}/'.")
+    finally:
+        tracer.close()
+    if args.resumo:
+        print(tracer.summary())
+
+
+def _export(args: argparse.Namespace):
+    from src.data_loader import DataLoader
+    from src.pipeline import export_schedules, export_student_timetables
+    from src.warm_start import LAST_RUN_FILE
+
+    arquivo = args.agendamento or args.dados / LAST_RUN_FILE
+    data = json.loads(arquivo.read_text(encoding="utf-8"))
+    # aceita tanto o arquivo de warm start quanto um exam_schedule puro
+    exam_schedule = data.get("exam_schedule", data)
+    loader = DataLoader(args.dados)
+    export_schedules(loader, exam_schedule, args.planilhas, consolidated=args.consolidado)
+    if args.alunos:
+        export_student_timetables(loader, exam_schedule, args.planilhas, args.alunos)
+    print(f"Planilhas geradas em '{args.planilhas}/'.")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    profile = None
+    if args.comando in ("schedule", "all"):
+        # Valores inválidos (--tempo 0, --gap 1...) são erro de argumento:
+        # parser.error sai com EXIT_INPUT_ERROR
+        try:
+            profile = profile_from_args(args)
+        except ValueError as ex:
+            parser.error(str(ex))
+    try:
+        if args.comando == "extract":
+            _extract(args)
+        elif args.comando == "schedule":
+            _schedule(args, profile)
+        elif args.comando == "export":
+            _export(args)
+        elif args.comando == "all":
+            if args.arquivos:
+                _extract(args)
+            _schedule(args, profile, output_dir=args.planilhas)
+    except RuntimeError as ex:
+        print(f"Erro: {ex}", file=sys.stderr)
+        return EXIT_NO_SOLUTION
+    except (FileNotFoundError, json.JSONDecodeError) as ex:
+        # Só o que arquivos ausentes ou malformados levantam; outros erros
+        # são falhas internas e devem aparecer com o traceback
+        print(f"Erro nos dados de entrada: {ex}", file=sys.stderr)
+        return EXIT_INPUT_ERROR
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
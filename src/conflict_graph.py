@@ -0,0 +1,206 @@
+from itertools import combinations
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Set, Tuple, TypeVar
+
+from src.encoding import mask_to_slots
+
+T = TypeVar("T", bound=Hashable)
+
+
+class UnionFind:
+    """
+    Estrutura union-find (disjoint set) com compressão de caminho e união
+    por tamanho, usada para agrupar exames ligados entre si.
+    """
+
+    def __init__(self, items: Iterable[T] = ()):
+        self.parent: Dict[T, T] = {}
+        self.size: Dict[T, int] = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item: T):
+        if item not in self.parent:
+            self.parent[item] = item
+            self.size[item] = 1
+
+    def find(self, item: T) -> T:
+        self.add(item)
+        raiz = item
+        while self.parent[raiz] != raiz:
+            raiz = self.parent[raiz]
+        while self.parent[item] != raiz:
+            self.parent[item], item = raiz, self.parent[item]
+        return raiz
+
+    def union(self, a: T, b: T) -> T:
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return ra
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+        return ra
+
+    def groups(self) -> List[List[T]]:
+        """
+        Retorna os grupos (componentes) na ordem de inserção dos itens.
+        """
+        por_raiz: Dict[T, List[T]] = {}
+        for item in self.parent:
+            por_raiz.setdefault(self.find(item), []).append(item)
+        return list(por_raiz.values())
+
+
+def sync_classes(
+    exams: Iterable[Tuple[str, str]],
+    courses_by_subject: Dict[str, List[str]],
+    free_slot_masks: Dict[str, int],
+) -> List[Tuple[List[Tuple[str, str]], int]]:
+    """
+    Agrupa os exames (curso, disciplina) sincronizados, isto é, a mesma
+    disciplina em cursos com algum slot livre em comum, em classes que
+    ocupam um único slot. Devolve (membros, domínio) por classe, com o
+    domínio (interseção dos slots livres dos cursos) como bitmask.
+
+    A relação "tem slot livre em comum" não é transitiva: A–B e B–C podem
+    se cruzar sem que A–C se cruzem, e o union-find juntaria os três numa
+    classe de domínio vazio. Essas classes são repartidas gulosamente, na
+    ordem dos exames: cada membro entra na primeira subclasse com a qual
+    ainda tem slot em comum, ou abre uma nova.
+    """
+    uf = UnionFind(exams)
+    for subj, cursos in courses_by_subject.items():
+        for c1, c2 in combinations(cursos, 2):
+            if free_slot_masks[c1] & free_slot_masks[c2]:
+                uf.union((c1, subj), (c2, subj))
+
+    classes: List[Tuple[List[Tuple[str, str]], int]] = []
+    for membros in uf.groups():
+        sub: List[Tuple[List[Tuple[str, str]], int]] = []
+        for exame in membros:
+            mask = free_slot_masks[exame[0]]
+            for i, (grupo, dominio) in enumerate(sub):
+                if dominio & mask:
+                    grupo.append(exame)
+                    sub[i] = (grupo, dominio & mask)
+                    break
+            else:
+                sub.append(([exame], mask))
+        classes.extend(sub)
+    return classes
+
+
+def build_conflict_graph(subject_sets: Iterable[Set[T]]) -> Dict[T, Set[T]]:
+    """
+    Monta o grafo de conflitos (lista de adjacência): duas disciplinas são
+    vizinhas se algum aluno faz as duas. Conjuntos repetidos entre alunos
+    são processados uma única vez.
+    """
+    adj: Dict[T, Set[T]] = {}
+    for subj_set in {frozenset(s) for s in subject_sets}:
+        for subj in subj_set:
+            adj.setdefault(subj, set()).update(subj_set - {subj})
+    return adj
+
+
+def clique_cover(subject_sets: Iterable[Set[T]]) -> List[List[T]]:
+    """
+    Cobre todas as arestas do grafo de conflitos com cliques maximais.
+
+    Cada conjunto de disciplinas de um aluno já é um clique; os conjuntos
+    distintos são usados como sementes (maiores primeiro) e estendidos
+    gulosamente até um clique maximal. Sementes cujas arestas já estão
+    todas cobertas são descartadas.
+    """
+    seeds = sorted(
+        {frozenset(s) for s in subject_sets if len(s) >= 2},
+        key=lambda s: (-len(s), sorted(map(str, s))),
+    )
+    adj = build_conflict_graph(seeds)
+    covered: Set[frozenset] = set()
+    cliques: List[List[T]] = []
+
+    for seed in seeds:
+        membros = sorted(seed, key=str)
+        if all(
+            frozenset((a, b)) in covered
+            for i, a in enumerate(membros)
+            for b in membros[i + 1:]
+        ):
+            continue
+
+        clique = set(seed)
+        candidatos = set.intersection(*(adj[v] for v in clique)) - clique
+        while candidatos:
+            # prioriza o vértice que cobre mais arestas ainda descobertas
+            melhor = max(
+                sorted(candidatos, key=str),
+                key=lambda v: sum(frozenset((v, u)) not in covered for u in clique),
+            )
+            clique.add(melhor)
+            candidatos &= adj[melhor]
+
+        ordenado = sorted(clique, key=str)
+        for i, a in enumerate(ordenado):
+            for b in ordenado[i + 1:]:
+                covered.add(frozenset((a, b)))
+        cliques.append(ordenado)
+
+    return cliques
+
+
+def maximal_subject_sets(subject_sets: Iterable[Set[T]]) -> List[frozenset]:
+    """
+    Colapsa conjuntos idênticos (classes de equivalência de alunos) e
+    descarta os dominados, isto é, contidos em outro conjunto: qualquer
+    restrição de soma ≤ k sobre o superconjunto já implica a do subconjunto.
+    """
+    distintos = sorted(
+        {frozenset(s) for s in subject_sets if s},
+        key=lambda s: (-len(s), sorted(map(str, s))),
+    )
+    maximais: List[frozenset] = []
+    for s in distintos:
+        if not any(s <= m for m in maximais):
+            maximais.append(s)
+    return maximais
+
+
+def maximal_masks(masks: Iterable[int], key: Callable[[int], Any] = int) -> List[int]:
+    """
+    maximal_subject_sets sobre bitmasks de disciplinas: m domina s se
+    s | m == m. 'key' desempata máscaras de mesmo tamanho (a ordem define a
+    ordem das restrições no modelo). Só são testadas as máximas que contêm
+    a disciplina de s com menos máximas já aceitas.
+    """
+    distintos = sorted(
+        {m for m in masks if m},
+        key=lambda m: (-bin(m).count("1"), key(m)),
+    )
+    maximais: List[int] = []
+    por_bit: Dict[int, List[int]] = {}
+    for s in distintos:
+        bits = mask_to_slots(s)
+        candidatas = min((por_bit.get(b, ()) for b in bits), key=len)
+        if any(s | m == m for m in candidatas):
+            continue
+        maximais.append(s)
+        for b in bits:
+            por_bit.setdefault(b, []).append(s)
+    return maximais
+
+
+def profiles_by_course(
+    subjects_by_student: Dict[Tuple[str, str], Set[str]],
+) -> Dict[str, List[frozenset]]:
+    """
+    Agrupa subjects_by_student por curso e aplica maximal_subject_sets.
+    """
+    sets_by_course: Dict[str, List[Set[str]]] = {}
+    for (curso, aluno), subj_set in subjects_by_student.items():
+        sets_by_course.setdefault(curso, []).append(subj_set)
+    return {
+        curso: maximal_subject_sets(sets)
+        for curso, sets in sets_by_course.items()
+    }
@@ -1,27 +1,83 @@
 import json
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Dict, FrozenSet, List, Mapping, Optional, Set, Tuple
+
+from src.conflict_graph import maximal_masks
+from src.encoding import StudentTable, SubjectsByStudent, mask_to_slots, slots_to_mask
+from src.instrumentation import NULL_TRACER, Tracer
+from src.snapshot import SNAPSHOT_CACHE, SNAPSHOT_FIELDS, SnapshotCache
+
+INPUT_FILES = (
+    "Horarios.json",
+    "AlunosEmRecuperacao.json",
+    "Dias.json",
+    "ExamesEmAula.json",
+)
+
+
+def index_class_exams(
+    exams_in_class: Dict[str, Dict[str, List[int]]],
+) -> Tuple[Dict[str, Dict[int, str]], List[Tuple[str, int, List[str]]]]:
+    """
+    Inverte ExamesEmAula.json (curso → disciplina → slots) em
+    curso → slot → disciplina. Quando duas disciplinas do mesmo curso
+    reivindicam o mesmo slot, fica a primeira (como antes no exportador) e
+    o conflito (curso, slot, disciplinas) é devolvido para ser exibido.
+    """
+    by_slot: Dict[str, Dict[int, str]] = {}
+    claims: Dict[Tuple[str, int], List[str]] = {}
+    for curso, disciplinas in exams_in_class.items():
+        slots_curso = by_slot.setdefault(curso, {})
+        for subj, slots in disciplinas.items():
+            for slot in slots:
+                slots_curso.setdefault(slot, subj)
+                claims.setdefault((curso, slot), []).append(subj)
+    conflicts = [
+        (curso, slot, subjs)
+        for (curso, slot), subjs in sorted(claims.items())
+        if len(subjs) > 1
+    ]
+    return by_slot, conflicts
 
 
 class DataLoader:
     """
     Carrega e prepara todos os dados necessários:
     - horários (schedules)
-    - alunos em recuperação (recovery_raw)
     - dias da semana (days)
     - exames em aula (exams_in_class)
+    - alunos em recuperação, guardados em student_table (ids inteiros e
+      disciplinas em CSR, ver src/encoding.py)
     E monta:
     - subjects_by_course (disciplinas por curso, já excluindo exames em aula)
-    - subjects_by_student (disciplinas por aluno, filtradas)
+    - subjects_by_student (visão (curso, aluno) → disciplinas filtradas
+      sobre student_table)
     - courses_by_subject (cursos por disciplina remanescente)
-    - free_slots (slots livres por curso)
+    - class_exam_by_slot (curso → slot → disciplina com exame em aula) e
+      class_exam_conflicts (slots reivindicados por mais de uma disciplina)
+    - free_slots / free_slot_masks (slots livres por curso, sem os de exame
+      em aula, como lista e como bitmask)
     - daily_slot_ranges (intervalos de slots por dia)
+    - student_profiles (conjuntos de disciplinas maximais e distintos por
+      curso, colapsando alunos com perfis idênticos ou contidos em outro)
+
+    Com 'snapshots' (padrão: SNAPSHOT_CACHE), o resultado da derivação é
+    gravado num snapshot binário e as cargas seguintes com os mesmos JSONs
+    só mapeiam esse arquivo (from_snapshot = True); None sempre relê os
+    JSONs.
     """
 
-    def __init__(self, base_path: Path):
+    def __init__(
+        self,
+        base_path: Path,
+        tracer: Tracer = NULL_TRACER,
+        snapshots: Optional[SnapshotCache] = SNAPSHOT_CACHE,
+    ):
         self.base_path = base_path
+        self.tracer = tracer
+        self.snapshots = snapshots
+        self.from_snapshot = False
         self.schedules: Dict[str, Dict[str, List[int]]] = {}
-        self.recovery_raw: Dict[str, Dict[str, List[str]]] = {}
         self.days: List[str] = []
         self.exams_in_class: Dict[str, Dict[str, List[int]]] = {}
 
@@ -30,10 +86,15 @@ class DataLoader:
 
         # estruturas a serem preenchidas
         self.subjects_by_course: Dict[str, Set[str]] = {}
-        self.subjects_by_student: Dict[Tuple[str, str], Set[str]] = {}
+        self.student_table = StudentTable(())
+        self.subjects_by_student: Mapping[Tuple[str, str], FrozenSet[str]] = {}
         self.courses_by_subject: Dict[str, List[str]] = {}
+        self.class_exam_by_slot: Dict[str, Dict[int, str]] = {}
+        self.class_exam_conflicts: List[Tuple[str, int, List[str]]] = []
         self.free_slots: Dict[str, List[int]] = {}
+        self.free_slot_masks: Dict[str, int] = {}
         self.daily_slot_ranges: List[range] = []
+        self.student_profiles: Dict[str, List[FrozenSet[str]]] = {}
 
         self._load_all()
 
@@ -42,53 +103,92 @@ class DataLoader:
         return json.loads(path.read_text(encoding="utf-8"))
 
     def _load_all(self):
-        # Carrega arquivos brutos
-        self.schedules = self._load_json("Horarios.json")
-        self.recovery_raw = self._load_json("AlunosEmRecuperacao.json")
-        self.days = self._load_json("Dias.json")
-        self.exams_in_class = self._load_json("ExamesEmAula.json")
+        chave = None
+        if self.snapshots is not None:
+            with self.tracer.phase("load.snapshot"):
+                chave = SnapshotCache.key(self.base_path, INPUT_FILES)
+                state = self.snapshots.get(chave)
+            if state is not None:
+                for nome, valor in state.items():
+                    setattr(self, nome, valor)
+                self.from_snapshot = True
+                self._count()
+                return
 
+        # Carrega arquivos brutos
+        with self.tracer.phase("load.parse"):
+            self.schedules = self._load_json("Horarios.json")
+            recovery = self._load_json("AlunosEmRecuperacao.json")
+            self.days = self._load_json("Dias.json")
+            self.exams_in_class = self._load_json("ExamesEmAula.json")
+
+        # O JSON dos alunos só é usado para montar a StudentTable; as
+        # strings ficam uma única vez nas tabelas de ids
+        with self.tracer.phase("load.derive"):
+            self._derive(recovery)
+        self._count()
+
+        if chave is not None:
+            try:
+                self.snapshots.put(chave, {nome: getattr(self, nome) for nome in SNAPSHOT_FIELDS})
+            except OSError:
+                pass  # o snapshot é só um atalho para a próxima carga
+
+    def _count(self):
+        if self.tracer.enabled:
+            self.tracer.count("students", len(self.subjects_by_student))
+            self.tracer.count("exams", sum(len(s) for s in self.subjects_by_course.values()))
+
+    def _derive(self, recovery: Dict[str, Dict[str, List[str]]]):
         # Determina quantos slots por dia e total de slots
         # (assume que todos os cursos têm a mesma estrutura de "seg", "ter", etc.)
         primeiro_curso = next(iter(self.schedules))
         self.slots_per_day = len(self.schedules[primeiro_curso]["seg"])
         self.total_slots = len(self.days) * self.slots_per_day
 
-        # Monta subjects_by_course e subjects_by_student
-        self._build_subjects()
+        # Indexa exames em aula por slot (usado por free_slots e pelo exportador)
+        self.class_exam_by_slot, self.class_exam_conflicts = index_class_exams(
+            self.exams_in_class
+        )
 
-        # Exclui disciplinas que têm exame em aula
-        self._exclude_exams_in_class()
+        # Monta a tabela de alunos, já sem as disciplinas com exame em aula
+        self._build_student_table(recovery)
 
-        # Reconstroi courses_by_subject
+        # Disciplinas por curso e cursos por disciplina
+        self._build_subjects_by_course()
         self._build_courses_by_subject()
 
+        # Agrupa alunos em perfis de disciplinas não dominados
+        self._build_student_profiles()
+
         # Calcula free_slots e daily_slot_ranges
         self._build_free_slots()
         self._build_daily_slot_ranges()
 
-    def _build_subjects(self):
-        # 1) Inicia subjects_by_course com todas as disciplinas dos alunos em recuperação
+    def _build_student_table(self, recovery: Dict[str, Dict[str, List[str]]]):
+        table = StudentTable(self.schedules)
+        for curso, alunos in recovery.items():
+            table.add_students(
+                table.course_id[curso], alunos.items(), self.exams_in_class.get(curso, {})
+            )
+        self.student_table = table
+        self.subjects_by_student = SubjectsByStudent(table)
+
+        # Conjuntos distintos de ids por curso: os passos seguintes não
+        # precisam de cada aluno, só dos perfis diferentes
+        self._id_sets_by_course: Dict[int, Set[Tuple[int, ...]]] = {}
+        ids, ptr = table.subject_ids, table.ptr
+        for i, c in enumerate(table.student_course):
+            self._id_sets_by_course.setdefault(c, set()).add(tuple(ids[ptr[i]:ptr[i + 1]]))
+
+    def _build_subjects_by_course(self):
+        table = self.student_table
         self.subjects_by_course = {curso: set() for curso in self.schedules}
-        self.subjects_by_student = {}
-
-        for curso, alunos in self.recovery_raw.items():
-            for aluno, disc_list in alunos.items():
-                subj_set = set(disc_list)
-                self.subjects_by_course[curso] |= subj_set
-                self.subjects_by_student[(curso, aluno)] = subj_set.copy()
-
-    def _exclude_exams_in_class(self):
-        # 2) Para cada curso que aparece em exams_in_class, retira do subjects_by_course
-        for curso, disciplinas in self.exams_in_class.items():
-            if curso in self.subjects_by_course:
-                to_remove = set(disciplinas.keys())
-                self.subjects_by_course[curso] -= to_remove
-
-        # 3) Atualiza subjects_by_student: cada aluno só mantém disciplinas restantes
-        for (curso, aluno), subj_set in list(self.subjects_by_student.items()):
-            restante = subj_set & self.subjects_by_course.get(curso, set())
-            self.subjects_by_student[(curso, aluno)] = restante
+        for c, id_sets in self._id_sets_by_course.items():
+            ids: Set[int] = set()
+            for id_set in id_sets:
+                ids.update(id_set)
+            self.subjects_by_course[table.courses[c]] = {table.subjects[i] for i in ids}
 
     def _build_courses_by_subject(self):
         self.courses_by_subject = {}
@@ -96,19 +196,40 @@ class DataLoader:
             for subj in subj_set:
                 self.courses_by_subject.setdefault(subj, []).append(curso)
 
+    def _build_student_profiles(self):
+        # Bitmasks sobre ids locais ao curso (inteiros pequenos), com os
+        # nomes ordenados como desempate, como em maximal_subject_sets
+        table = self.student_table
+        self.student_profiles = {}
+        for c, id_sets in self._id_sets_by_course.items():
+            local = {g: k for k, g in enumerate(sorted({i for s in id_sets for i in s}))}
+            por_mask = {}
+            for id_set in id_sets:
+                mask = 0
+                for g in id_set:
+                    mask |= 1 << local[g]
+                por_mask[mask] = sorted(table.subjects[g] for g in id_set)
+            self.student_profiles[table.courses[c]] = [
+                frozenset(por_mask[m]) for m in maximal_masks(por_mask, key=por_mask.get)
+            ]
+
     def _build_free_slots(self):
         def lin(day_idx: int, period_idx: int) -> int:
             return day_idx * self.slots_per_day + period_idx
 
-        free = {}
+        self.free_slot_masks = {}
         for curso, agenda in self.schedules.items():
-            slots = []
+            mask = 0
             for idx_dia, nome_dia in enumerate(self.days):
                 for idx_per, flag in enumerate(agenda[nome_dia]):
                     if flag == 0:
-                        slots.append(lin(idx_dia, idx_per))
-            free[curso] = slots
-        self.free_slots = free
+                        mask |= 1 << lin(idx_dia, idx_per)
+            # um slot com exame em aula não recebe outra prova
+            mask &= ~slots_to_mask(self.class_exam_by_slot.get(curso, {}))
+            self.free_slot_masks[curso] = mask
+        self.free_slots = {
+            curso: mask_to_slots(mask) for curso, mask in self.free_slot_masks.items()
+        }
 
     def _build_daily_slot_ranges(self):
         ranges = []
@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+
+class JsonDiskCache:
+    """
+    Cache em disco de valores JSON, uma entrada '<chave>.json' por valor em
+    cache_dir (subclasses com outro formato trocam 'suffix', get e put).
+    O mtime marca o último uso; acima de max_entries, as entradas
+    menos usadas recentemente são removidas.
+
+    Seguro entre execuções concorrentes: cada gravação vai para um arquivo
+    temporário próprio e é publicada com os.replace (atômico), então um
+    leitor nunca vê uma entrada pela metade; leitura e despejo toleram
+    entradas removidas por outro processo no meio do caminho.
+    """
+
+    suffix = ".json"
+
+    def __init__(self, cache_dir: Path, max_entries: int):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.suffix}"
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)  # marca como usado recentemente
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return data
+
+    def put(self, key: str, value: Any):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self._evict()
+
+    def _evict(self):
+        entradas = []
+        for path in self.cache_dir.glob(f"*{self.suffix}"):
+            try:
+                entradas.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue  # removida por outro processo
+        entradas.sort(reverse=True)
+        for _, path in entradas[self.max_entries:]:
+            path.unlink(missing_ok=True)
+
+    def clear(self) -> int:
+        """
+        Invalida o cache inteiro; retorna quantas entradas foram removidas.
+        """
+        removidas = 0
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob(f"*{self.suffix}"):
+                path.unlink(missing_ok=True)
+                removidas += 1
+        return removidas
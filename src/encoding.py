@@ -0,0 +1,149 @@
+from array import array
+from collections.abc import ItemsView, Mapping
+from typing import Container, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+def slots_to_mask(slots: Iterable[int]) -> int:
+    """
+    Conjunto de slots → bitmask (bit s ligado se o slot s pertence ao conjunto).
+    """
+    mask = 0
+    for slot in slots:
+        mask |= 1 << slot
+    return mask
+
+
+def mask_to_slots(mask: int) -> List[int]:
+    """
+    Bitmask → lista ordenada dos bits ligados.
+    """
+    slots = []
+    while mask:
+        low = mask & -mask
+        slots.append(low.bit_length() - 1)
+        mask ^= low
+    return slots
+
+
+class StudentTable:
+    """
+    Representação compacta dos alunos em recuperação:
+    - courses / subjects: tabelas de ids (cada nome guardado uma única vez)
+    - student_course, student_names: curso e nome de cada aluno (id = posição)
+    - ptr / subject_ids: disciplinas de cada aluno em formato CSR, isto é,
+      os ids do aluno i estão em subject_ids[ptr[i]:ptr[i + 1]], ordenados
+
+    Perfis e slots livres são comparados como bitmasks (slots_to_mask,
+    maximal_masks) em vez de conjuntos de strings.
+    """
+
+    def __init__(self, courses: Iterable[str]):
+        self.courses: List[str] = list(courses)
+        self.course_id: Dict[str, int] = {c: i for i, c in enumerate(self.courses)}
+        self.subjects: List[str] = []
+        self.subject_id: Dict[str, int] = {}
+        self.student_names: List[str] = []
+        self.student_course = array("I")
+        self.ptr = array("I", [0])
+        self.subject_ids = array("I")
+
+    @classmethod
+    def from_arrays(
+        cls,
+        courses: List[str],
+        subjects: List[str],
+        student_names: List[str],
+        student_course: Sequence[int],
+        ptr: Sequence[int],
+        subject_ids: Sequence[int],
+    ) -> "StudentTable":
+        """
+        Remonta a tabela a partir de arrays já prontos (ex.: memoryviews
+        sobre um snapshot mapeado em memória, ver src/snapshot.py).
+        """
+        table = cls(courses)
+        table.subjects = subjects
+        table.subject_id = {s: i for i, s in enumerate(subjects)}
+        table.student_names = student_names
+        table.student_course = student_course
+        table.ptr = ptr
+        table.subject_ids = subject_ids
+        return table
+
+    def __len__(self) -> int:
+        return len(self.student_names)
+
+    def intern_subject(self, name: str) -> int:
+        sid = self.subject_id.get(name)
+        if sid is None:
+            sid = self.subject_id[name] = len(self.subjects)
+            self.subjects.append(name)
+        return sid
+
+    def add_students(
+        self,
+        course_id: int,
+        students: Iterable[Tuple[str, Iterable[str]]],
+        exclude: Container[str] = (),
+    ):
+        """
+        Acrescenta os alunos (nome, disciplinas) de um curso, ignorando as
+        disciplinas em 'exclude' (ex.: as que têm exame em aula).
+        """
+        subject_id, intern = self.subject_id, self.intern_subject
+        names, course, ids, ptr = self.student_names, self.student_course, self.subject_ids, self.ptr
+        for name, subjects in students:
+            ids.extend(sorted({
+                subject_id[s] if s in subject_id else intern(s)
+                for s in subjects
+                if s not in exclude
+            }))
+            names.append(name)
+            course.append(course_id)
+            ptr.append(len(ids))
+
+    def subjects_of(self, student: int) -> Sequence[int]:
+        return self.subject_ids[self.ptr[student]:self.ptr[student + 1]]
+
+
+class SubjectsByStudent(Mapping):
+    """
+    Visão (curso, aluno) → frozenset de disciplinas sobre uma StudentTable,
+    com a mesma interface do antigo dict subjects_by_student. Os conjuntos
+    são montados sob demanda (com os nomes internados da tabela) e o índice
+    por chave só é criado no primeiro acesso direto.
+    """
+
+    def __init__(self, table: StudentTable):
+        self._table = table
+        self._index: Optional[Dict[Tuple[str, str], int]] = None
+
+    def _key(self, student: int) -> Tuple[str, str]:
+        t = self._table
+        return t.courses[t.student_course[student]], t.student_names[student]
+
+    def _value(self, student: int) -> FrozenSet[str]:
+        t = self._table
+        return frozenset(t.subjects[sid] for sid in t.subjects_of(student))
+
+    def __getitem__(self, key: Tuple[str, str]) -> FrozenSet[str]:
+        if self._index is None:
+            self._index = {self._key(i): i for i in range(len(self._table))}
+        return self._value(self._index[key])
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        return (self._key(i) for i in range(len(self._table)))
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def items(self) -> "_StudentItems":
+        return _StudentItems(self)
+
+
+class _StudentItems(ItemsView):
+    # Percorre a tabela em ordem, sem passar pelo índice de chaves
+    def __iter__(self):
+        view: SubjectsByStudent = self._mapping
+        for i in range(len(view)):
+            yield view._key(i), view._value(i)
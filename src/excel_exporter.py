@@ -1,7 +1,28 @@
 import os
+import time
 import xlsxwriter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from src.instrumentation import NULL_TRACER, Tracer
+
+CONSOLIDATED_FILE = "TodosOsCursos.xlsx"
+
+# Abaixo disso o pool custa mais do que economiza: cada arquivo leva
+# poucos ms e subir os workers (spawn no Windows) leva centenas de ms
+PARALLEL_MIN_FILES = 48
+
+TIME_LABELS = [
+    "07:00 – 07:55",
+    "07:55 – 08:50",
+    "09:10 – 10:05",
+    "10:05 – 11:00",
+    "13:00 – 13:55",
+    "13:55 – 14:50",
+    "15:10 – 16:05",
+    "16:05 – 17:00",
+]
 
 class ExcelExporter:
     """
@@ -9,8 +30,14 @@ class ExcelExporter:
     - schedules (dados brutos de ocupação: indica 0 para livre, 1 para ocupado)
     - days (lista de dias da semana)
     - exam_schedule (lista de disciplinas agendadas por slot)
-    - exams_in_class (disciplinas com exame em aula para exibir "1(subj)")
-    E gera um arquivo .xlsx por curso na pasta 'planilhas/'.
+    - class_exam_by_slot (curso → slot → disciplina com exame em aula, de
+      DataLoader, para exibir "1(subj)")
+    E gera um arquivo .xlsx por curso em output_dir (padrão 'planilhas/').
+    A partir de PARALLEL_MIN_FILES arquivos (ou com max_workers > 1), cada
+    curso é escrito por um worker de um pool de processos; abaixo disso,
+    ou com max_workers=1, tudo é escrito no próprio processo. Com
+    'consolidated', grava também esse arquivo com uma aba por curso.
+    file_times guarda o tempo de escrita de cada arquivo.
     """
 
     def __init__(
@@ -18,107 +45,185 @@ class ExcelExporter:
         schedules: Dict[str, Dict[str, List[int]]],
         days: List[str],
         exam_schedule: Dict[str, List[List[str]]],
-        exams_in_class: Dict[str, Dict[str, List[int]]],
+        class_exam_by_slot: Dict[str, Dict[int, str]],
         slots_per_day: int,
+        output_dir: Path = Path("planilhas"),
+        tracer: Tracer = NULL_TRACER,
+        max_workers: Optional[int] = None,
+        consolidated: Optional[str] = None,
     ):
         self.schedules = schedules
         self.days = days
         self.exam_schedule = exam_schedule
-        self.exams_in_class = exams_in_class
+        self.class_exam_by_slot = class_exam_by_slot
         self.slots_per_day = slots_per_day
+        self.output_dir = Path(output_dir)
+        self.tracer = tracer
+        self.max_workers = max_workers
+        self.consolidated = consolidated
+        self.file_times: Dict[str, float] = {}
 
-        self.TIME_LABELS = [
-            "07:00 – 07:55",
-            "07:55 – 08:50",
-            "09:10 – 10:05",
-            "10:05 – 11:00",
-            "13:00 – 13:55",
-            "13:55 – 14:50",
-            "15:10 – 16:05",
-            "16:05 – 17:00",
-        ]  # Deve ter len = slots_per_day
+        self.TIME_LABELS = TIME_LABELS  # Deve ter len = slots_per_day
 
         self._export_all()
 
     def _export_all(self):
-        os.makedirs("planilhas", exist_ok=True)
-
-        for curso in self.schedules:
-            self._export_por_curso(curso)
-
-    def _export_por_curso(self, curso: str):
-        wb = xlsxwriter.Workbook(f"planilhas/{curso}.xlsx")
-        ws = wb.add_worksheet("grade")
-
-        # ── formatos ─────────────────────────────────────────
-        hdr_day = wb.add_format({
-            "bold": True,
-            "align": "center",
-            "valign": "vcenter",
-            "border": 1,
-            "bg_color": "#D9D9D9"
-        })
-        hdr_time = wb.add_format({
-            "align": "center",
-            "valign": "vcenter",
-            "border": 1,
-            "bg_color": "#D9D9D9"
-        })
-        fmt_cell = wb.add_format({
-            "align": "center",
-            "valign": "vcenter",
-            "border": 1,
-            "text_wrap": True
-        })
-        fmt_num = wb.add_format({
-            "align": "center",
-            "valign": "vcenter",
-            "border": 1,
-            "num_format": "0"
-        })
-
-        # ── largura de colunas e altura de linhas ───────────
-        ws.set_column(0, 0, 15)               # primeira coluna para TIME_LABELS
-        ws.set_column(1, len(self.days), 22)  # uma coluna para cada dia
-        ws.set_row(0, 25)                     # altura da linha de cabeçalho
-
-        # ── cabeçalho (dias) ────────────────────────────────
-        ws.write(0, 0, "")  # canto superior esquerdo vazio
-        for col, dia in enumerate(self.days, start=1):
-            ws.write(0, col, dia.capitalize(), hdr_day)
-
-        # ── TIME_LABELS na primeira coluna ──────────────────
-        for row, label in enumerate(self.TIME_LABELS, start=1):
-            ws.write(row, 0, label, hdr_time)
-
-        # ── preencher células ───────────────────────────────
-        total_slots = len(self.days) * self.slots_per_day
-        for dia_idx, dia in enumerate(self.days):
-            for periodo_idx in range(self.slots_per_day):
-                row = periodo_idx + 1
-                col = dia_idx + 1
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        grades = {curso: self._grade(curso) for curso in self.schedules}
+        tarefas = [
+            (str(self.output_dir / f"{curso}.xlsx"), [("grade", grade)])
+            for curso, grade in grades.items()
+        ]
+        nomes = list(self.schedules)
+        if self.consolidated:
+            nomes_abas = sheet_names(grades)
+            tarefas.append((
+                str(self.output_dir / self.consolidated),
+                [(nomes_abas[curso], grade) for curso, grade in grades.items()],
+            ))
+            nomes.append("consolidado")
+
+        cabecalho = [dia.capitalize() for dia in self.days]
+        args = (tarefas, [cabecalho] * len(tarefas), [self.TIME_LABELS] * len(tarefas))
+        if self.max_workers is None:
+            em_serie = len(tarefas) < PARALLEL_MIN_FILES
+        else:
+            em_serie = self.max_workers == 1 or len(tarefas) <= 1
+        if em_serie:
+            tempos = list(map(_write_workbook, *args))
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                tempos = list(pool.map(_write_workbook, *args))
+
+        for nome, (caminho, abas), segundos in zip(nomes, tarefas, tempos):
+            self.file_times[caminho] = segundos
+            # os workbooks são escritos nos workers; as fases chegam prontas
+            self.tracer.extend([{"type": "phase", "name": f"export.{nome}", "seconds": segundos}])
+            # cabeçalho (dias + canto), rótulos de horário e a grade
+            self.tracer.count(
+                "cells_written",
+                len(abas) * (1 + len(self.days) + len(self.TIME_LABELS) + len(self.days) * self.slots_per_day),
+            )
+
+    def _grade(self, curso: str) -> List[List[Union[str, int]]]:
+        """
+        Conteúdo da grade de um curso, linha a linha (um período por linha,
+        um dia por coluna): "1(subj)" para exame em aula, as disciplinas
+        agendadas separadas por " | " ou 0/1 conforme schedules original.
+        """
+        em_aula = self.class_exam_by_slot.get(curso, {})
+        grade: List[List[Union[str, int]]] = []
+        for periodo_idx in range(self.slots_per_day):
+            linha: List[Union[str, int]] = []
+            for dia_idx, dia in enumerate(self.days):
                 slot_index = dia_idx * self.slots_per_day + periodo_idx
 
                 # 1) verifica se é "exame em aula" para este curso
-                celula_exame_aula = None
-                if curso in self.exams_in_class:
-                    for subj, slots in self.exams_in_class[curso].items():
-                        if slot_index in slots:
-                            celula_exame_aula = f"1({subj})"
-                            break
-
-                if celula_exame_aula:
-                    ws.write(row, col, celula_exame_aula, fmt_cell)
+                subj = em_aula.get(slot_index)
+                if subj is not None:
+                    linha.append(f"1({subj})")
                     continue
 
                 # 2) se não for exame em aula, verifica se há exame agendado
                 exames_aqui = self.exam_schedule[curso][slot_index]
                 if exames_aqui:
-                    ws.write(row, col, " | ".join(exames_aqui), fmt_cell)
+                    linha.append(" | ".join(exames_aqui))
                 else:
                     # 3) escreve 0/1 conforme schedules original
                     raw_flag = self.schedules[curso][dia][periodo_idx]
-                    busy_flag = 0 if raw_flag == 0 else 1
-                    ws.write_number(row, col, busy_flag, fmt_num)
+                    linha.append(0 if raw_flag == 0 else 1)
+            grade.append(linha)
+        return grade
+
+
+def sheet_names(cursos: Iterable[str]) -> Dict[str, str]:
+    """
+    Nome de aba para cada curso. O Excel limita o nome a 31 caracteres,
+    proíbe []:*?/\\ e compara nomes sem diferenciar maiúsculas; cursos que
+    colidem depois de cortados ganham um sufixo "~2", "~3", ...
+    """
+    nomes: Dict[str, str] = {}
+    usados: Set[str] = set()
+    for curso in cursos:
+        base = "".join("_" if c in "[]:*?/\\" else c for c in curso).strip("'") or "_"
+        nome, n = base[:31], 1
+        while nome.lower() in usados:
+            n += 1
+            sufixo = f"~{n}"
+            nome = base[:31 - len(sufixo)] + sufixo
+        usados.add(nome.lower())
+        nomes[curso] = nome
+    return nomes
+
+
+def _write_workbook(
+    tarefa: Tuple[str, List[Tuple[str, List[List[Union[str, int]]]]]],
+    dias: List[str],
+    time_labels: List[str],
+) -> float:
+    """
+    Escreve um .xlsx com uma aba por grade e devolve o tempo gasto. Em
+    constant_memory o xlsxwriter descarrega cada linha ao passar para a
+    próxima, então tudo é escrito em ordem de linha.
+    """
+    inicio = time.perf_counter()
+    caminho, abas = tarefa
+    wb = xlsxwriter.Workbook(caminho, {"constant_memory": True})
+
+    # ── formatos ─────────────────────────────────────────
+    hdr_day = wb.add_format({
+        "bold": True,
+        "align": "center",
+        "valign": "vcenter",
+        "border": 1,
+        "bg_color": "#D9D9D9"
+    })
+    hdr_time = wb.add_format({
+        "align": "center",
+        "valign": "vcenter",
+        "border": 1,
+        "bg_color": "#D9D9D9"
+    })
+    fmt_cell = wb.add_format({
+        "align": "center",
+        "valign": "vcenter",
+        "border": 1,
+        "text_wrap": True
+    })
+    fmt_num = wb.add_format({
+        "align": "center",
+        "valign": "vcenter",
+        "border": 1,
+        "num_format": "0"
+    })
+
+    for nome, grade in abas:
+        ws = wb.add_worksheet(nome)
+
+        # ── largura de colunas e altura de linhas ───────────
+        ws.set_column(0, 0, 15)          # primeira coluna para TIME_LABELS
+        ws.set_column(1, len(dias), 22)  # uma coluna para cada dia
+        ws.set_row(0, 25)                # altura da linha de cabeçalho
+
+        # ── cabeçalho (dias) ────────────────────────────────
+        ws.write(0, 0, "")  # canto superior esquerdo vazio
+        for col, dia in enumerate(dias, start=1):
+            ws.write(0, col, dia, hdr_day)
+
+        # ── TIME_LABELS + células, linha a linha ────────────
+        # Grade e rótulos podem ter tamanhos diferentes (slots_per_day ≠
+        # len(TIME_LABELS)): cada linha escreve o que existir dos dois
+        for row in range(1, max(len(time_labels), len(grade)) + 1):
+            if row <= len(time_labels):
+                ws.write(row, 0, time_labels[row - 1], hdr_time)
+            if row > len(grade):
+                continue
+            for col, valor in enumerate(grade[row - 1], start=1):
+                if isinstance(valor, str):
+                    ws.write(row, col, valor, fmt_cell)
+                else:
+                    ws.write_number(row, col, valor, fmt_num)
 
-        wb.close()
+    wb.close()
+    return time.perf_counter() - inicio
@@ -0,0 +1,114 @@
+from itertools import combinations
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from src.conflict_graph import sync_classes
+from src.encoding import slots_to_mask
+
+Exam = Tuple[str, str]
+
+
+def greedy_schedule(
+    schedules: Dict[str, Dict[str, List[int]]],
+    subjects_by_course: Dict[str, Set[str]],
+    courses_by_subject: Dict[str, List[str]],
+    free_slots: Dict[str, List[int]],
+    student_profiles: Dict[str, List[FrozenSet[str]]],
+    slots_per_day: int,
+    total_slots: int,
+    max_per_day: int = 3,
+    fixed: Optional[Dict[Exam, int]] = None,
+) -> Optional[Dict[str, List[List[str]]]]:
+    """
+    Agendamento guloso no estilo DSATUR, sem CP-SAT, com as mesmas regras
+    do modelo do Scheduler:
+    - cada classe de exames sincronizados (ver
+      conflict_graph.sync_classes) vira um único vértice, com o domínio
+      da classe;
+    - vértices de um mesmo perfil de aluno são vizinhos (slots distintos);
+    - cada perfil tem no máximo max_per_day exames por dia.
+
+    A cada passo colore o vértice com menos slots ainda possíveis
+    (desempate: mais vizinhos sem cor) no menor slot possível, o que
+    também tende a minimizar o último slot usado. Devolve o exam_schedule
+    ou None se algum vértice ficar sem slot possível.
+
+    fixed (exame → slot) é colorido antes de tudo, como as fixações do
+    modelo: slots fora do domínio da classe são ignorados, e uma fixação
+    que conflite com outra já feita devolve None.
+    """
+    exames = [
+        (curso, subj)
+        for curso in schedules
+        for subj in sorted(subjects_by_course.get(curso, []))
+    ]
+    masks = {c: slots_to_mask(s) for c, s in free_slots.items()}
+
+    classes = sync_classes(exames, courses_by_subject, masks)
+    grupos = [membros for membros, _ in classes]
+    dominio = [mask for _, mask in classes]
+    if not all(dominio):  # curso sem nenhum slot livre
+        return None
+    grupo_de: Dict[Exam, int] = {e: g for g, membros in enumerate(grupos) for e in membros}
+
+    vizinhos: List[Set[int]] = [set() for _ in grupos]
+    # perfis com mais exames que o limite diário: (grupos do perfil)
+    perfis_limitados: List[List[int]] = []
+    perfis_de: List[List[int]] = [[] for _ in grupos]
+    for curso, perfis in student_profiles.items():
+        for perfil in perfis:
+            gs = [grupo_de[(curso, subj)] for subj in perfil]
+            for a, b in combinations(gs, 2):
+                vizinhos[a].add(b)
+                vizinhos[b].add(a)
+            if len(gs) > max_per_day:
+                for g in gs:
+                    perfis_de[g].append(len(perfis_limitados))
+                perfis_limitados.append(gs)
+
+    n_dias = -(-total_slots // slots_per_day)
+    dia_mask = [((1 << slots_per_day) - 1) << (d * slots_per_day) for d in range(n_dias)]
+    por_dia = [[0] * n_dias for _ in perfis_limitados]
+
+    # slots vetados a cada vértice: usados por vizinhos ou em dias em que
+    # algum perfil dele já atingiu o limite
+    bloqueado = [0] * len(grupos)
+    sem_cor = [len(v) for v in vizinhos]  # vizinhos ainda sem slot
+    slot_de: List[Optional[int]] = [None] * len(grupos)
+    restantes = set(range(len(grupos)))
+
+    def colorir(g: int, slot: int):
+        slot_de[g] = slot
+        restantes.discard(g)
+        for u in vizinhos[g]:
+            bloqueado[u] |= 1 << slot
+            sem_cor[u] -= 1
+        dia = slot // slots_per_day
+        for p in perfis_de[g]:
+            por_dia[p][dia] += 1
+            if por_dia[p][dia] == max_per_day:
+                for u in perfis_limitados[p]:
+                    bloqueado[u] |= dia_mask[dia]
+
+    for exame, slot in sorted((fixed or {}).items()):
+        g = grupo_de.get(exame)
+        if g is None or not dominio[g] >> slot & 1 or slot_de[g] == slot:
+            continue
+        if slot_de[g] is not None or bloqueado[g] >> slot & 1:
+            return None
+        colorir(g, slot)
+
+    while restantes:
+        g = min(
+            restantes,
+            key=lambda v: (bin(dominio[v] & ~bloqueado[v]).count("1"), -sem_cor[v], v),
+        )
+        mask = dominio[g] & ~bloqueado[g]
+        if not mask:
+            return None
+        colorir(g, (mask & -mask).bit_length() - 1)
+
+    schedule = {curso: [[] for _ in range(total_slots)] for curso in schedules}
+    for g, membros in enumerate(grupos):
+        for curso, subj in membros:
+            schedule[curso][slot_de[g]].append(subj)
+    return schedule
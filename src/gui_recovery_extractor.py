@@ -2,9 +2,17 @@ import flet as ft
 import os
 import re
 import json
+import threading
 from pathlib import Path
 
-from src.recovery_utils import extract_json, merge_jsons
+from src.recovery_utils import (
+    DEFAULT_FIRST_ROW,
+    DEFAULT_HEADERS,
+    DEFAULT_LAST_ROW,
+    ExtractionCancelled,
+    extract_many,
+    merge_jsons,
+)
 
 GREY_C = "#2A2D33"
 HEADER_RE = re.compile(r'^[A-Z]+(?:,[A-Z]+)*$')
@@ -15,6 +23,8 @@ class GUIRecoveryExtractor:
     Interface Flet para extrair e mesclar planilhas .xlsx de alunos em recuperação:
     - Permite selecionar múltiplos arquivos .xlsx
     - Solicita cabeçalhos e linhas inicial/final
+    - Extrai as planilhas em paralelo (pool de processos), fora da thread
+      de eventos, com barra de progresso e botão de cancelar
     - Cria ou sobrescreve 'dados/AlunosEmRecuperacao.json'
     """
 
@@ -24,6 +34,7 @@ class GUIRecoveryExtractor:
         self.initial_page: ft.Column | None = None
         self.after_file_selected: ft.Column | None = None
         self.sheet_containers: list[ft.Container] = []
+        self.cancel_event: threading.Event | None = None
 
     def _on_header_focus(self, e: ft.ControlEvent):
         e.control.border_color = ft.Colors.BLUE_800
@@ -90,21 +101,21 @@ class GUIRecoveryExtractor:
         - linha final
         """
         txt_headers = ft.TextField(
-            value="F,J,N,R,V,Z,AD,AH,AL,AP,AT,AX,BB,BF,BJ",
+            value=DEFAULT_HEADERS,
             expand=True,
             border_color=ft.Colors.BLUE_800,
             focused_border_color=ft.Colors.BLUE,
             on_focus=lambda e: self._on_header_focus(e),
         )
         txt_first = ft.TextField(
-            value="3",
+            value=str(DEFAULT_FIRST_ROW),
             width=60,
             border_color=ft.Colors.BLUE_800,
             focused_border_color=ft.Colors.BLUE,
             on_focus=lambda e: self._on_header_focus(e),
         )
         txt_last = ft.TextField(
-            value="39",
+            value=str(DEFAULT_LAST_ROW),
             width=60,
             border_color=ft.Colors.BLUE_800,
             focused_border_color=ft.Colors.BLUE,
@@ -170,6 +181,12 @@ class GUIRecoveryExtractor:
         )
         btn_carregar = ft.ElevatedButton(text="Carregar", expand=True, height=50)
         btn_load = ft.ElevatedButton(text="Carregar dados em JSON", expand=True, height=40)
+        btn_cancel = ft.ElevatedButton(text="Cancelar", height=40)
+        progress_bar = ft.ProgressBar(value=0, expand=True)
+        progress_text = ft.Text("")
+        progress_row = ft.Row(
+            [progress_bar, progress_text, btn_cancel], spacing=10, visible=False
+        )
 
         self.initial_page = ft.Column(
             [
@@ -235,6 +252,7 @@ class GUIRecoveryExtractor:
                 controls.append(c)
 
             controls.append(ft.Row([btn_load], spacing=10))
+            controls.append(progress_row)
             self.after_file_selected.controls = controls
 
             self.initial_page.visible = False
@@ -296,19 +314,59 @@ class GUIRecoveryExtractor:
                     return
 
             paths = [p.strip() for p in self.txt_path.value.split(",")]
-            jsons: list[dict] = []
+            jobs = []
             for idx, sheet in enumerate(self.sheet_containers):
                 headers = sheet.txt_fields[0].value
                 firstRow = int(sheet.txt_fields[1].value)
                 lastRow = int(sheet.txt_fields[2].value)
-                jsons.append(extract_json(paths[idx], headers, firstRow, lastRow))
+                jobs.append((paths[idx], headers, firstRow, lastRow))
+
+            self.cancel_event = threading.Event()
+            btn_load.disabled = True
+            btn_cancel.disabled = False
+            progress_bar.value = 0
+            progress_text.value = f"0/{len(jobs)}"
+            progress_row.visible = True
+            page.update()
+
+            threading.Thread(target=run_extraction, args=(jobs,), daemon=True).start()
 
+        def on_progress(done: int, total: int, filepath: str):
+            progress_bar.value = done / total
+            progress_text.value = f"{done}/{total} — {os.path.basename(filepath)}"
+            page.update()
+
+        def run_extraction(jobs: list[tuple[str, str, int, int]]):
+            # Executa fora da thread de eventos do Flet para não travar a UI
             output_file = "dados/AlunosEmRecuperacao.json"
-            merged = merge_jsons(jsons)
+            try:
+                merged = merge_jsons(
+                    extract_many(jobs, on_progress=on_progress, cancel=self.cancel_event)
+                )
+            except ExtractionCancelled:
+                page.open(
+                    ft.SnackBar(ft.Text("Extração cancelada."), bgcolor=ft.Colors.YELLOW_100)
+                )
+            except Exception as ex:
+                page.open(
+                    ft.SnackBar(ft.Text(f"Erro na extração: {ex}"), bgcolor=ft.Colors.RED_100)
+                )
+            else:
+                self._confirm_and_save(page, output_file, merged)
+            finally:
+                btn_load.disabled = False
+                progress_row.visible = False
+                page.update()
 
-            self._confirm_and_save(page, output_file, merged)
+        def on_cancel(e: ft.ControlEvent):
+            if self.cancel_event is not None:
+                self.cancel_event.set()
+            btn_cancel.disabled = True
+            progress_text.value = "Cancelando..."
+            page.update()
 
         btn_load.on_click = on_load
+        btn_cancel.on_click = on_cancel
 
         page.add(self.initial_page, self.after_file_selected)
 
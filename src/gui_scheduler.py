@@ -3,6 +3,7 @@ import json
 from pathlib import Path
 from typing import Dict, List, Set
 
+from src.data_loader import index_class_exams
 from src.json_operations import confirm_and_save
 
 
@@ -153,6 +154,15 @@ class GUIScheduler:
                 if nome in all_configs:
                     for disc, idxs in all_configs[nome].items():
                         self.selections[disc] = set(idxs)
+                    _, conflitos = index_class_exams({nome: all_configs[nome]})
+                    if conflitos:
+                        slots = ", ".join(
+                            f"{slot} ({' / '.join(subjs)})" for _, slot, subjs in conflitos
+                        )
+                        page.open(ft.SnackBar(
+                            ft.Text(f"Slots com mais de um exame em aula: {slots}"),
+                            bgcolor=ft.Colors.ORANGE_100,
+                        ))
 
             export_button.disabled = False
             page.add(scrollable)
@@ -0,0 +1,146 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_NULL_CONTEXT = nullcontext()
+
+
+class Tracer:
+    """
+    Instrumentação leve do pipeline run_scheduling:
+    - phase(nome): cronômetro de fase (context manager), com pico de
+      memória Python (tracemalloc) durante a fase; fases podem se aninhar
+    - count(nome, valor): contadores acumulados (variáveis, restrições,
+      tuplas, células escritas, ...)
+    - event(tipo, **campos): eventos estruturados (log do CP-SAT,
+      soluções encontradas, ...)
+
+    Cada registro vira uma linha JSON em 'path' (se informado) e fica em
+    'records'; summary() devolve um resumo legível para o console.
+    Desabilitado (NULL_TRACER), todos os métodos retornam imediatamente.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        enabled: bool = True,
+        track_memory: bool = True,
+    ):
+        self.enabled = enabled
+        self.records: List[Dict[str, Any]] = []
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, float] = {}
+        self.peaks: Dict[str, int] = {}
+        self._t0 = time.perf_counter()
+        self._file = None
+        self._stack: List[List[Any]] = []  # [nome, pico_bytes]
+        self._track_memory = enabled and track_memory
+        self._started_tracemalloc = False
+
+        if not enabled:
+            return
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(path, "w", encoding="utf-8")
+        if self._track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def _emit(self, record: Dict[str, Any]):
+        record["t"] = round(time.perf_counter() - self._t0, 6)
+        self.records.append(record)
+        if self._file is not None:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _update_peaks(self):
+        # Propaga o pico desde o último reset para todas as fases abertas
+        pico = tracemalloc.get_traced_memory()[1]
+        for entrada in self._stack:
+            entrada[1] = max(entrada[1], pico)
+        tracemalloc.reset_peak()
+
+    def phase(self, name: str):
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._phase(name)
+
+    @contextmanager
+    def _phase(self, name: str) -> Iterator[None]:
+        if self._track_memory:
+            self._update_peaks()
+        entrada = [name, 0]
+        self._stack.append(entrada)
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            duracao = time.perf_counter() - inicio
+            if self._track_memory:
+                self._update_peaks()
+            self._stack.pop()
+            self.phases[name] = self.phases.get(name, 0.0) + duracao
+            record = {"type": "phase", "name": name, "seconds": round(duracao, 6)}
+            if self._track_memory:
+                self.peaks[name] = max(self.peaks.get(name, 0), entrada[1])
+                record["peak_kb"] = entrada[1] // 1024
+            self._emit(record)
+
+    def count(self, name: str, value: float = 1):
+        if not self.enabled:
+            return
+        self.counters[name] = self.counters.get(name, 0) + value
+        self._emit({"type": "counter", "name": name, "value": value})
+
+    def event(self, kind: str, **fields: Any):
+        if not self.enabled:
+            return
+        self._emit({"type": "event", "kind": kind, **fields})
+
+    def extend(self, records: List[Dict[str, Any]], **extra: Any):
+        """
+        Incorpora registros produzidos em outro processo (ex.: componentes
+        resolvidas no pool do Scheduler), acrescentando os campos 'extra'.
+        """
+        if not self.enabled:
+            return
+        for record in records:
+            record = {**record, **extra}
+            record.pop("t", None)
+            nome = record.get("name")
+            if record["type"] == "counter":
+                self.counters[nome] = self.counters.get(nome, 0) + record["value"]
+            elif record["type"] == "phase":
+                self.phases[nome] = self.phases.get(nome, 0.0) + record["seconds"]
+            self._emit(record)
+
+    def summary(self) -> str:
+        linhas = ["── Resumo da execução ──"]
+        for nome, seg in self.phases.items():
+            pico = self.peaks.get(nome)
+            mem = f"  pico {pico / 1024 / 1024:.1f} MB" if pico is not None else ""
+            linhas.append(f"  {nome:<24} {seg:8.3f}s{mem}")
+        for nome, valor in self.counters.items():
+            linhas.append(f"  {nome:<24} {valor:>10,.0f}")
+        if resource is not None:
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            linhas.append(f"  {'RSS máximo (processo)':<24} {rss / 1024:8.1f} MB")
+        return "\n".join(linhas)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+
+NULL_TRACER = Tracer(enabled=False)
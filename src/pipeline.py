@@ -0,0 +1,251 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.data_loader import DataLoader
+from src.excel_exporter import CONSOLIDATED_FILE, ExcelExporter
+from src.instrumentation import NULL_TRACER, Tracer
+from src.scheduler import Scheduler
+from src.solution_cache import CACHE_DIR, SolutionCache
+from src.solver_profile import SolverProfile
+from src.student_exporter import StudentExporter
+from src.warm_start import LAST_RUN_FILE, load_last_run, save_last_run, unchanged_exams
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_DATA_DIR = PROJECT_ROOT / "dados"
+DEFAULT_OUTPUT_DIR = Path("planilhas")
+
+
+def extract_recovery(
+    jobs: Sequence[Tuple[str, str, int, int]],
+    output_file: Path,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Extrai as planilhas de 'jobs' em paralelo, mescla e grava o resultado
+    em output_file (sobrescrevendo, sem confirmação).
+    """
+    # openpyxl só é necessário na extração
+    from src.recovery_utils import extract_many, merge_jsons
+
+    merged = merge_jsons(extract_many(jobs, max_workers=max_workers))
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    output_file.write_text(json.dumps(merged, ensure_ascii=False, indent=4), encoding="utf-8")
+    return merged
+
+
+def schedule_exams(
+    loader: DataLoader,
+    profile: Optional[SolverProfile] = None,
+    warm_start: bool = True,
+    fix_unchanged: bool = False,
+    use_cache: bool = True,
+    tracer: Tracer = NULL_TRACER,
+) -> Dict[str, List[List[str]]]:
+    """
+    Resolve (ou lê do cache) o exam_schedule dos dados de 'loader' e o
+    persiste em '<dados>/UltimoAgendamento.json' para o próximo warm start.
+
+    Com warm_start, o agendamento salvo da última execução é usado como
+    sugestão inicial; com fix_unchanged, os exames cujos alunos não mudaram
+    ficam no mesmo slot. Com use_cache, se as entradas e o perfil forem
+    idênticos a uma execução anterior (com fix_unchanged, também o
+    agendamento salvo), o exam_schedule é lido de '.cache/agendamentos/'
+    sem resolver.
+    """
+    profile = profile or SolverProfile()
+    cache = SolutionCache(CACHE_DIR)
+    # As fixações dependem do agendamento salvo: ele entra na chave
+    fixacoes = loader.base_path / LAST_RUN_FILE if warm_start and fix_unchanged else None
+    cache_key = SolutionCache.key(loader.base_path, profile, fixacoes)
+    exam_schedule = cache.get(cache_key) if use_cache else None
+    if exam_schedule is not None:
+        tracer.event("cache_hit", key=cache_key)
+        print("Cache: agendamento reaproveitado de uma execução idêntica.")
+    else:
+        with tracer.phase("schedule"):
+            exam_schedule = _solve_schedule(loader, profile, warm_start, fix_unchanged, tracer)
+        cache.put(cache_key, exam_schedule)
+    save_last_run(loader.base_path / LAST_RUN_FILE, exam_schedule, loader.subjects_by_student)
+    return exam_schedule
+
+
+def _solve_schedule(
+    loader: DataLoader,
+    profile: SolverProfile,
+    warm_start: bool,
+    fix_unchanged: bool,
+    tracer: Tracer,
+) -> Dict[str, List[List[str]]]:
+    last_run = load_last_run(loader.base_path / LAST_RUN_FILE) if warm_start else None
+    fixed_exams = set()
+    if last_run and fix_unchanged:
+        fixed_exams = unchanged_exams(last_run, loader.subjects_by_student, loader.free_slots)
+
+    sched = Scheduler(
+        schedules=loader.schedules,
+        subjects_by_course=loader.subjects_by_course,
+        subjects_by_student=loader.subjects_by_student,
+        courses_by_subject=loader.courses_by_subject,
+        free_slots=loader.free_slots,
+        daily_slot_ranges=loader.daily_slot_ranges,
+        slots_per_day=loader.slots_per_day,
+        total_slots=loader.total_slots,
+        student_profiles=loader.student_profiles,
+        decompose=True,
+        profile=profile,
+        hint_schedule=last_run["exam_schedule"] if last_run else None,
+        fixed_exams=fixed_exams,
+        tracer=tracer,
+    )
+
+    for subj, c1, c2 in sched.sync_split_pairs:
+        print(
+            f"⚠ Sincronização: {subj} não cabe num slot comum a todos os seus "
+            f"cursos; {c1} e {c2} fazem a prova em horários distintos."
+        )
+
+    report = sched.preprocess_report
+    # Sem modelo (motor guloso, ou solução gulosa já no limite inferior
+    # em todas as componentes) não há o que relatar sobre ele
+    if "cpsat" in sched.solve_report["engine"]:
+        print(
+            f"Pré-processamento: {report['daily_limit_posted']} restrições de "
+            f"limite diário postadas, {report['daily_limit_removed']} removidas, "
+            f"{report['symmetries_broken']} simetrias quebradas."
+        )
+        if last_run:
+            print(
+                f"Warm start: {report['hinted_exams']} exames sugeridos, "
+                f"{len(fixed_exams)} fixados."
+            )
+
+    print(
+        f"Limite inferior: {report['lower_bound']} (primeiro slot livre "
+        f"{report['lower_bound_exam']}, perfis {report['lower_bound_clique']})."
+    )
+
+    solve = sched.solve_report
+    motor = {"cpsat": "CP-SAT", "greedy": "Heurística gulosa", "pinned": "Exames fixados"}.get(solve["engine"], solve["engine"])
+    prova = {"bound": " (provado pelo limite inferior)", "search": " (provado pela busca)"}
+    print(
+        f"{motor}: status={solve['status']}{prova.get(solve['proof'], '')} "
+        f"objetivo={solve['objective']:.0f} "
+        f"bound={solve['bound']:.0f} tempo={solve['wall_time']:.2f}s"
+    )
+    if profile.horizon_search:
+        dias = int(solve["objective"]) // loader.slots_per_day + 1
+        print(f"Horizonte: {dias} de {len(loader.days)} dia(s) de prova necessário(s).")
+
+    return sched.get_exam_schedule()
+
+
+def export_schedules(
+    loader: DataLoader,
+    exam_schedule: Dict[str, List[List[str]]],
+    output_dir: Path = DEFAULT_OUTPUT_DIR,
+    tracer: Tracer = NULL_TRACER,
+    consolidated: bool = False,
+    max_workers: Optional[int] = None,
+) -> Dict[str, float]:
+    """
+    Gera as planilhas por curso (e, com consolidated, também
+    CONSOLIDATED_FILE com uma aba por curso) e devolve o tempo de escrita
+    de cada arquivo.
+    """
+    for curso, slot, subjs in loader.class_exam_conflicts:
+        print(
+            f"⚠ ExamesEmAula.json: {curso}, slot {slot} tem exame em aula de "
+            f"{', '.join(subjs)}; a planilha mostra só {subjs[0]}."
+        )
+
+    with tracer.phase("export"):
+        exporter = ExcelExporter(
+            schedules=loader.schedules,
+            days=loader.days,
+            exam_schedule=exam_schedule,
+            class_exam_by_slot=loader.class_exam_by_slot,
+            slots_per_day=loader.slots_per_day,
+            output_dir=output_dir,
+            tracer=tracer,
+            max_workers=max_workers,
+            consolidated=CONSOLIDATED_FILE if consolidated else None,
+        )
+
+    tempos = exporter.file_times
+    if not tempos:
+        return tempos
+    mais_lento = max(tempos, key=tempos.get)
+    print(
+        f"Exportação: {len(tempos)} arquivo(s), {sum(tempos.values()):.2f}s de escrita "
+        f"(mais lento: {Path(mais_lento).name} em {tempos[mais_lento]:.2f}s)."
+    )
+    return tempos
+
+
+def export_student_timetables(
+    loader: DataLoader,
+    exam_schedule: Dict[str, List[List[str]]],
+    output_dir: Path = DEFAULT_OUTPUT_DIR,
+    fmt: str = "xlsx",
+    tracer: Tracer = NULL_TRACER,
+) -> Path:
+    """
+    Grava o cronograma de provas de cada aluno (ver StudentExporter) e
+    devolve o caminho do arquivo gerado.
+    """
+    exporter = StudentExporter(
+        exam_schedule=exam_schedule,
+        subjects_by_student=loader.subjects_by_student,
+        days=loader.days,
+        slots_per_day=loader.slots_per_day,
+        output_dir=output_dir,
+        fmt=fmt,
+        tracer=tracer,
+    )
+    print(
+        f"Cronogramas por aluno: {exporter.students_written} aluno(s), "
+        f"{exporter.rows_written} prova(s) em '{exporter.output_file}' ({exporter.seconds:.2f}s)."
+    )
+    return exporter.output_file
+
+
+def run_scheduling(
+    profile: Optional[SolverProfile] = None,
+    warm_start: bool = True,
+    fix_unchanged: bool = False,
+    use_cache: bool = True,
+    trace_file: Optional[Path] = None,
+    trace_summary: bool = False,
+    base_path: Path = DEFAULT_DATA_DIR,
+    output_dir: Path = DEFAULT_OUTPUT_DIR,
+    consolidated: bool = False,
+    student_format: Optional[str] = None,
+):
+    """
+    Carrega todos os JSONs de base_path ('dados/') → monta o modelo CP-SAT →
+    gera as planilhas em output_dir ('planilhas/'). 'profile' define os
+    parâmetros do CP-SAT (padrão: perfil "balanced"); warm_start,
+    fix_unchanged e use_cache: ver schedule_exams.
+
+    trace_file grava a instrumentação (fases, contadores, log do CP-SAT)
+    em JSON lines; trace_summary imprime um resumo ao final. consolidated
+    grava também a planilha única com uma aba por curso; student_format
+    ("xlsx", "csv" ou "json") grava também o cronograma por aluno.
+    """
+    tracer = Tracer(trace_file) if trace_file or trace_summary else NULL_TRACER
+    try:
+        with tracer.phase("load"):
+            loader = DataLoader(base_path, tracer=tracer)
+        exam_schedule = schedule_exams(
+            loader, profile, warm_start, fix_unchanged, use_cache, tracer
+        )
+        export_schedules(loader, exam_schedule, output_dir, tracer, consolidated)
+        if student_format:
+            export_student_timetables(loader, exam_schedule, output_dir, student_format, tracer)
+    finally:
+        tracer.close()
+
+    print(f"⏳ Planilhas de horário geradas em '{output_dir}/' com sucesso.")
+    if trace_summary:
+        print(tracer.summary())
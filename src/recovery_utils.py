@@ -1,7 +1,35 @@
+import hashlib
 import openpyxl
+import threading
 import unicodedata
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import chain, repeat
+from openpyxl.utils import column_index_from_string
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Sequence, Tuple
+
+from src.disk_cache import JsonDiskCache
+
+ExtractionJob = Tuple[str, str, int, int]  # (filepath, headers, firstRow, lastRow)
+
+# Layout padrão das planilhas de notas (colunas de nota e linhas dos alunos)
+DEFAULT_HEADERS = "F,J,N,R,V,Z,AD,AH,AL,AP,AT,AX,BB,BF,BJ"
+DEFAULT_FIRST_ROW = 3
+DEFAULT_LAST_ROW = 39
+
+
+class ExtractionCancelled(Exception):
+    """Extração interrompida pelo usuário (ver extract_many)."""
+
+
+# Incrementar quando a regra de extração mudar, invalidando o cache
+EXTRACTION_VERSION = 1
+
+# Cache das extrações: só planilhas alteradas (ou com outros cabeçalhos e
+# linhas) são lidas de novo
+EXTRACTION_CACHE = JsonDiskCache(
+    Path(__file__).parent.parent / ".cache" / "extracoes", max_entries=256
+)
 
 def process_str(s: str) -> str:
     raw = str(s or "").strip()
@@ -9,35 +37,130 @@ def process_str(s: str) -> str:
     no_accents = "".join(ch for ch in normalized if unicodedata.category(ch) != 'Mn')
     return no_accents.lower().replace(" ", "_")
 
+def _value_at(row: Sequence[Any], idx: int) -> Optional[Any]:
+    return row[idx] if idx < len(row) else None
+
+
 def extract(filepath: str, headers: str, firstRow: int, lastRow: int) -> List[List[str]]:
+    """
+    Lê a planilha em modo somente leitura (streaming): apenas as linhas
+    firstRow..lastRow e o intervalo de colunas que contém os cabeçalhos
+    pedidos são percorridos, com memória constante por planilha.
+    Linhas além do fim da planilha contam como vazias (nota 0).
+    """
     path = Path(filepath)
-    wb = openpyxl.load_workbook(path, data_only=True)
-    ws = wb.active
     cols = [h.strip() for h in headers.split(",") if h.strip()]
-    header_map: Dict[str, str] = {col: process_str(ws[f"{col}1"].value) for col in cols}
-    results: List[List[str]] = []
-    for i in range(firstRow, lastRow + 1):
-        subjects: List[str] = []
-        for col in cols:
-            cell = ws[f"{col}{i}"]
-            raw = cell.value
-            score = float(raw) if isinstance(raw, (int, float)) else 0.0
-            if score < 6.0:
-                subjects.append(header_map[col])
-        if subjects:
-            results.append(subjects)
-    return results
-
-def extract_json(filepath: str, headers: str, firstRow: int, lastRow: int) -> Dict[str, Any]:
+    col_idx = [column_index_from_string(col) for col in cols]
+    min_col, max_col = min(col_idx), max(col_idx)
+    offsets = [idx - min_col for idx in col_idx]
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        header_row = next(
+            ws.iter_rows(min_row=1, max_row=1, min_col=min_col, max_col=max_col, values_only=True),
+            (),
+        )
+        header_names = [process_str(_value_at(header_row, off)) for off in offsets]
+
+        rows = ws.iter_rows(
+            min_row=firstRow, max_row=lastRow, min_col=min_col, max_col=max_col, values_only=True
+        )
+        # iter_rows para na última linha existente; completa com linhas vazias
+        rows = chain(rows, repeat(()))
+
+        results: List[List[str]] = []
+        for _, row in zip(range(firstRow, lastRow + 1), rows):
+            subjects: List[str] = []
+            for off, name in zip(offsets, header_names):
+                raw = _value_at(row, off)
+                score = float(raw) if isinstance(raw, (int, float)) else 0.0
+                if score < 6.0:
+                    subjects.append(name)
+            if subjects:
+                results.append(subjects)
+        return results
+    finally:
+        wb.close()
+
+def extraction_key(filepath: str, headers: str, firstRow: int, lastRow: int) -> str:
+    """
+    SHA-256 do conteúdo do arquivo mais (cabeçalhos, firstRow, lastRow).
+    O nome do arquivo não entra: ele só define a chave do JSON de saída.
+    """
+    cols = [h.strip() for h in headers.split(",") if h.strip()]
+    h = hashlib.sha256(f"v{EXTRACTION_VERSION}|{','.join(cols)}|{firstRow}|{lastRow}|".encode())
+    with open(filepath, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+def extract_json(
+    filepath: str,
+    headers: str,
+    firstRow: int,
+    lastRow: int,
+    cache: Optional[JsonDiskCache] = EXTRACTION_CACHE,
+) -> Dict[str, Any]:
     path = Path(filepath)
     sheet_name = path.stem
-    data = extract(filepath, headers, firstRow, lastRow)
-    mapped: Dict[str, Any] = {}
-    for idx, subjects in enumerate(data):
-        mapped[str(idx)] = subjects
+
+    key = extraction_key(filepath, headers, firstRow, lastRow) if cache else None
+    mapped = cache.get(key) if cache else None
+    if mapped is None:
+        data = extract(filepath, headers, firstRow, lastRow)
+        mapped = {}
+        for idx, subjects in enumerate(data):
+            mapped[str(idx)] = subjects
+        if cache:
+            cache.put(key, mapped)
     return {sheet_name: mapped}
 
-def merge_jsons(json_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+def extract_many(
+    jobs: Sequence[ExtractionJob],
+    max_workers: Optional[int] = None,
+    on_progress: Optional[Callable[[int, int, str], None]] = None,
+    cancel: Optional[threading.Event] = None,
+    cache: Optional[JsonDiskCache] = EXTRACTION_CACHE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Executa extract_json para várias planilhas em um pool de processos.
+
+    Os resultados são entregues sob demanda, na mesma ordem de 'jobs', à
+    medida que ficam prontos (pode ser consumido direto por merge_jsons).
+    on_progress(concluídas, total, arquivo) é chamado a cada planilha
+    terminada. Se 'cancel' for sinalizado, as planilhas pendentes são
+    descartadas e ExtractionCancelled é levantada. 'cache' é repassado a
+    extract_json (None desativa).
+    """
+    total = len(jobs)
+    if total == 0:
+        return
+    pool = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        futures = [pool.submit(extract_json, *job, cache) for job in jobs]
+        indice = {fut: i for i, fut in enumerate(futures)}
+        pendentes = set(futures)
+        prontos: Dict[int, Dict[str, Any]] = {}
+        proximo = concluidas = 0
+        while pendentes:
+            # timeout curto para reagir ao cancelamento sem esperar a planilha atual
+            feitos, pendentes = wait(pendentes, timeout=0.2, return_when=FIRST_COMPLETED)
+            if cancel is not None and cancel.is_set():
+                raise ExtractionCancelled()
+            for fut in feitos:
+                i = indice[fut]
+                prontos[i] = fut.result()
+                concluidas += 1
+                if on_progress is not None:
+                    on_progress(concluidas, total, jobs[i][0])
+            while proximo in prontos:
+                yield prontos.pop(proximo)
+                proximo += 1
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def merge_jsons(json_list: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
     merged: Dict[str, Any] = {}
     for jd in json_list:
         for key, value in jd.items():
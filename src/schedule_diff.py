@@ -0,0 +1,58 @@
+from dataclasses import dataclass, field
+from typing import Dict, Set, Tuple
+
+from src.data_loader import DataLoader
+
+Student = Tuple[str, str]
+
+
+@dataclass
+class ScheduleDiff:
+    """
+    Alterações nos alunos em recuperação desde o último agendamento,
+    expressas sobre subjects_by_student (disciplinas já sem exame em aula):
+    - added: alunos novos e suas disciplinas
+    - removed: alunos que saíram
+    - changed: alunos existentes com o novo conjunto de disciplinas
+
+    Mudanças em ExamesEmAula.json aparecem como 'changed' (a disciplina
+    some ou volta para os alunos do curso); use ScheduleDiff.between para
+    calcular o diff a partir de duas cargas de 'dados/'.
+    """
+
+    added: Dict[Student, Set[str]] = field(default_factory=dict)
+    removed: Set[Student] = field(default_factory=set)
+    changed: Dict[Student, Set[str]] = field(default_factory=dict)
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+    def apply(self, subjects_by_student: Dict[Student, Set[str]]) -> Dict[Student, Set[str]]:
+        """
+        Retorna uma cópia de subjects_by_student com o diff aplicado.
+        """
+        result = {
+            aluno: set(subjs)
+            for aluno, subjs in subjects_by_student.items()
+            if aluno not in self.removed
+        }
+        for aluno, subjs in {**self.added, **self.changed}.items():
+            result[aluno] = set(subjs)
+        return result
+
+    @classmethod
+    def between(cls, old: DataLoader, new: DataLoader) -> "ScheduleDiff":
+        if old.schedules != new.schedules or old.days != new.days:
+            raise ValueError(
+                "Horarios.json ou Dias.json mudaram: é preciso reagendar do zero."
+            )
+        antes, depois = old.subjects_by_student, new.subjects_by_student
+        return cls(
+            added={a: set(s) for a, s in depois.items() if a not in antes},
+            removed={a for a in antes if a not in depois},
+            changed={
+                a: set(s)
+                for a, s in depois.items()
+                if a in antes and antes[a] != s
+            },
+        )
@@ -1,6 +1,23 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
 from itertools import combinations
 from ortools.sat.python import cp_model
-from typing import Dict, List, Set, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from src.bounds import latest_slot_bounds
+from src.conflict_graph import UnionFind, clique_cover, profiles_by_course, sync_classes
+from src.encoding import mask_to_slots, slots_to_mask
+from src.greedy import greedy_schedule
+from src.instrumentation import NULL_TRACER, Tracer
+from src.schedule_diff import ScheduleDiff
+from src.solver_profile import SolverProfile
+from src.warm_start import slot_by_exam, students_by_exam
+
+
+DAY_ENCODINGS = ("channel", "table")
+MAX_EXAMS_PER_DAY = 3
 
 
 class Scheduler:
@@ -20,85 +37,452 @@ class Scheduler:
         daily_slot_ranges: List[range],
         slots_per_day: int,
         total_slots: int,
+        day_encoding: str = "channel",
+        student_profiles: Optional[Dict[str, List[FrozenSet[str]]]] = None,
+        solve: bool = True,
+        decompose: bool = False,
+        max_workers: Optional[int] = None,
+        profile: Optional[SolverProfile] = None,
+        hint_schedule: Optional[Dict[str, List[List[str]]]] = None,
+        fixed_exams: Optional[Set[Tuple[str, str]]] = None,
+        lower_bound: int = 0,
+        tracer: Tracer = NULL_TRACER,
     ):
+        if day_encoding not in DAY_ENCODINGS:
+            raise ValueError(f"day_encoding inválido: {day_encoding!r}")
+
         self.schedules = schedules
         self.subjects_by_course = subjects_by_course
         self.subjects_by_student = subjects_by_student
         self.courses_by_subject = courses_by_subject
         self.free_slots = free_slots
+        self.free_slot_masks = {c: slots_to_mask(s) for c, s in free_slots.items()}
         self.daily_slot_ranges = daily_slot_ranges
         self.slots_per_day = slots_per_day
         self.total_slots = total_slots
+        self.day_encoding = day_encoding
+        self.student_profiles = student_profiles
+        if self.student_profiles is None:
+            self.student_profiles = profiles_by_course(subjects_by_student)
+        self.preprocess_report: Dict[str, int] = {}
+        self.max_workers = max_workers
+        self.profile = profile or SolverProfile()
+        self.solve_report: Dict[str, Any] = {}
+        self.hint_schedule = hint_schedule
+        self.hint_slots = slot_by_exam(hint_schedule) if hint_schedule else {}
+        self.fixed_exams = fixed_exams or set()
+        self.components: List[List[Tuple[str, str]]] = []
+        self.tracer = tracer
+
+        self.exam_schedule: Dict[str, List[List[str]]] = {}
+        self._reset_model()
+
+        self._sync_classes()
+        self._symmetric_classes()
+
+        self.decompose = decompose
+        self.lower_bound = lower_bound
+        self.horizon = total_slots  # slots considerados no modelo
+        self.horizon_floor = 0  # fim do maior horizonte provado inviável
+        self._compute_bounds()
+        self.greedy_schedule: Optional[Dict[str, List[List[str]]]] = None
+        self.greedy_seconds = 0.0
+        self._run_greedy()
+        # Na busca por horizonte o modelo é montado a cada tentativa. Com
+        # solve=False (medições) ele é montado mesmo que a solução gulosa
+        # já atinja o limite inferior
+        if (
+            not decompose
+            and self.profile.engine == "cpsat"
+            and not self.profile.horizon_search
+            and (not solve or not self._greedy_is_optimal())
+        ):
+            self._build()
+        if solve:
+            self.solve()
+
+    def _sync_classes(self):
+        # Exames sincronizados entre cursos compartilham uma única variável,
+        # com o domínio já intersectado (ver conflict_graph.sync_classes)
+        exames = [
+            (curso, subj)
+            for curso in self.schedules
+            for subj in sorted(self.subjects_by_course.get(curso, []))
+        ]
+        self.sync = sync_classes(exames, self.courses_by_subject, self.free_slot_masks)
+        self.sync_class_of: Dict[Tuple[str, str], int] = {
+            exame: idx for idx, (membros, _) in enumerate(self.sync) for exame in membros
+        }
+        # Pares (disciplina, curso, curso) que se cruzam mas ficaram em
+        # classes distintas (caso não transitivo repartido)
+        self.sync_split_pairs: List[Tuple[str, str, str]] = sorted(
+            (subj, c1, c2)
+            for subj, cursos in self.courses_by_subject.items()
+            for c1, c2 in combinations(cursos, 2)
+            if self.free_slot_masks[c1] & self.free_slot_masks[c2]
+            and self.sync_class_of[(c1, subj)] != self.sync_class_of[(c2, subj)]
+        )
+        self.preprocess_report["sync_classes"] = sum(len(m) > 1 for m, _ in self.sync)
+        self.preprocess_report["sync_merged"] = len(exames) - len(self.sync)
+        self.preprocess_report["sync_split"] = len({subj for subj, _, _ in self.sync_split_pairs})
+
+    def _symmetric_classes(self):
+        # Classes intercambiáveis: mesmos cursos, mesmos alunos em cada
+        # curso e mesmo domínio. Trocar os slots de duas delas não muda
+        # nenhuma restrição nem o objetivo, então basta fixar uma ordem.
+        # Classes com exames fixados ficam de fora
+        alunos = students_by_exam(self.subjects_by_student)
+        por_assinatura: Dict[Any, List[int]] = {}
+        for idx, (membros, mask) in enumerate(self.sync):
+            if any(exame in self.fixed_exams for exame in membros):
+                continue
+            turmas = tuple(
+                (curso, tuple(alunos.get(curso, {}).get(subj, ())))
+                for curso, subj in sorted(membros)
+            )
+            if not all(a for _, a in turmas):
+                continue
+            por_assinatura.setdefault((mask, turmas), []).append(idx)
+        self.symmetric: List[List[int]] = [g for g in por_assinatura.values() if len(g) > 1]
+        self.preprocess_report["symmetry_groups"] = len(self.symmetric)
 
+    def _compute_bounds(self):
+        # Limites inferiores de latest_slot (ver bounds.latest_slot_bounds),
+        # somados a lower_bound (já conhecido; no modo decompose, o global
+        # repassado a cada componente). O maior vira o mínimo do domínio de
+        # latest_slot: o CP-SAT para assim que o atinge e, se a solução
+        # gulosa já o atinge, nem há busca
+        with self.tracer.phase("bounds"):
+            bounds = latest_slot_bounds(
+                self.schedules,
+                self.subjects_by_course,
+                self.courses_by_subject,
+                self.free_slots,
+                self.student_profiles,
+                self.slots_per_day,
+                MAX_EXAMS_PER_DAY,
+            )
+        self.lower_bound = max(self.lower_bound, *bounds.values())
+        self.preprocess_report["lower_bound"] = self.lower_bound
+        for nome, valor in bounds.items():
+            self.preprocess_report[f"lower_bound_{nome}"] = valor
+
+    def _greedy_is_optimal(self) -> bool:
+        return (
+            self.greedy_schedule is not None
+            and self.preprocess_report["greedy_latest"] <= self.lower_bound
+        )
+
+    def _run_greedy(self):
+        # Heurística gulosa (ver greedy.greedy_schedule), antes do modelo e
+        # respeitando fixed_exams: sem hint_schedule, a solução dela é a
+        # sugestão ao CP-SAT; com profile.engine == "greedy" é o próprio
+        # exam_schedule
+        inicio = time.perf_counter()
+        with self.tracer.phase("greedy"):
+            self.greedy_schedule = greedy_schedule(
+                self.schedules,
+                self.subjects_by_course,
+                self.courses_by_subject,
+                self.free_slots,
+                self.student_profiles,
+                self.slots_per_day,
+                self.total_slots,
+                MAX_EXAMS_PER_DAY,
+                fixed={e: self.hint_slots[e] for e in self.fixed_exams if e in self.hint_slots},
+            )
+        self.greedy_seconds = time.perf_counter() - inicio
+        if self.greedy_schedule is None:
+            return
+        slots = slot_by_exam(self.greedy_schedule)
+        self.preprocess_report["greedy_latest"] = max(slots.values(), default=0)
+        if not self.hint_slots:
+            self.hint_slots = slots
+
+    def _reset_model(self):
         self.model = cp_model.CpModel()
         self.exam_slot: Dict[Tuple[str, str], cp_model.IntVar] = {}
+        self.class_vars: List[cp_model.IntVar] = []
         self.bool_var: Dict[Tuple[str, str, int], cp_model.BoolVar] = {}
-        self.exam_schedule: Dict[str, List[List[str]]] = {}
+        self.latest: Optional[cp_model.IntVar] = None
 
-        self._build_model()
-        self._solve()
+    def _build(self):
+        with self.tracer.phase("build"):
+            self._build_model()
+        if self.tracer.enabled:
+            for nome, valor in self.model_stats().items():
+                self.tracer.count(nome, valor)
 
     def _build_model(self):
-        # 1) Criar variáveis de decisão para cada (curso, disciplina)
-        for curso in self.schedules:
-            domain = cp_model.Domain.FromValues(sorted(self.free_slots[curso]))
-            for subj in self.subjects_by_course.get(curso, []):
-                var = self.model.NewIntVarFromDomain(domain, f"{curso}_{subj}")
-                self.exam_slot[(curso, subj)] = var
-
-        # 2) Restrição: um aluno não pode ter dois exames ao mesmo tempo
-        for (curso, aluno), subj_set in self.subjects_by_student.items():
-            for subj1, subj2 in combinations(sorted(subj_set), 2):
-                self.model.Add(
-                    self.exam_slot[(curso, subj1)] != self.exam_slot[(curso, subj2)]
+        # 1) Criar uma variável de decisão por classe de exames
+        #    sincronizados, compartilhada por todos os (curso, disciplina)
+        #    da classe, com o domínio já intersectado
+        for membros, mask in self.sync:
+            curso, subj = membros[0]
+            domain = cp_model.Domain.FromValues(self._domain(mask))
+            var = self.model.NewIntVarFromDomain(domain, f"{curso}_{subj}")
+            self.class_vars.append(var)
+            for exame in membros:
+                self.exam_slot[exame] = var
+
+        # 2) Restrição: um aluno não pode ter dois exames ao mesmo tempo.
+        #    Os perfis de disciplinas de cada curso formam um grafo de
+        #    conflitos, coberto por cliques maximais → AllDifferent
+        for curso, perfis in self.student_profiles.items():
+            for clique in clique_cover(perfis):
+                self.model.AddAllDifferent(
+                    [self.exam_slot[(curso, subj)] for subj in clique]
                 )
 
+        # 2b) Quebra de simetria: as classes de um grupo intercambiável
+        #     (mesmos alunos, mesmo domínio) compartilham alunos, logo têm
+        #     slots distintos; impõe slots crescentes, na ordem das
+        #     sugestões para não contrariá-las
+        quebradas = 0
+        for grupo in self.symmetric:
+            ordem = sorted(grupo, key=lambda idx: (self._class_hint(idx), idx))
+            for a, b in zip(ordem, ordem[1:]):
+                self.model.Add(self.class_vars[a] < self.class_vars[b])
+                quebradas += 1
+        self.preprocess_report["symmetries_broken"] = quebradas
+
         # 3) Criar booleano b[(curso, subj, dia)] = 1 se exame em dia_idx
-        for (curso, subj), var in self.exam_slot.items():
-            for dia_idx, slot_range in enumerate(self.daily_slot_ranges):
-                b = self.model.NewBoolVar(f"b_{curso}_{subj}_{dia_idx}")
-                # b=1 se var ∈ slot_range, senao 0
-                allowed = [(k, 1) for k in slot_range] + [
-                    (k, 0)
-                    for k in range(self.total_slots)
-                    if k not in slot_range
-                ]
-                self.model.AddAllowedAssignments([var, b], allowed)
-                self.bool_var[(curso, subj, dia_idx)] = b
-
-        # 4) Cada aluno pode ter no máximo 3 exames por dia
-        for (curso, aluno), subj_set in self.subjects_by_student.items():
-            for dia_idx in range(len(self.daily_slot_ranges)):
-                soma = sum(
-                    self.bool_var[(curso, subj, dia_idx)]
-                    for subj in subj_set
-                )
-                self.model.Add(soma <= 3)
-
-        # 5) Sincronizar mesma disciplina entre cursos que compartilhem slot livre
-        for subj, cursos in self.courses_by_subject.items():
-            for c1, c2 in combinations(cursos, 2):
-                intersec = set(self.free_slots[c1]) & set(self.free_slots[c2])
-                if intersec:
-                    self.model.Add(
-                        self.exam_slot[(c1, subj)] == self.exam_slot[(c2, subj)]
+        #    (um conjunto por classe, compartilhado como a variável)
+        for (membros, mask), var in zip(self.sync, self.class_vars):
+            nome = "_".join(membros[0])
+            if self.day_encoding == "channel":
+                bools = self._add_day_channel(nome, mask, var)
+            else:
+                bools = self._add_day_tables(nome, var)
+            for curso, subj in membros:
+                for dia_idx, b in enumerate(bools):
+                    self.bool_var[(curso, subj, dia_idx)] = b
+
+        # 4) Cada aluno pode ter no máximo 3 exames por dia. Basta postar
+        #    para os perfis maximais com mais de 3 disciplinas: perfis
+        #    repetidos, contidos em outro ou pequenos não restringem nada
+        n_dias = len(self.daily_slot_ranges)
+        postadas = 0
+        for curso, perfis in self.student_profiles.items():
+            for perfil in perfis:
+                if len(perfil) <= MAX_EXAMS_PER_DAY:
+                    continue
+                for dia_idx in range(n_dias):
+                    soma = sum(
+                        self.bool_var[(curso, subj, dia_idx)]
+                        for subj in perfil
                     )
+                    self.model.Add(soma <= MAX_EXAMS_PER_DAY)
+                    postadas += 1
+        originais = len(self.subjects_by_student) * n_dias
+        self.preprocess_report["daily_limit_posted"] = postadas
+        self.preprocess_report["daily_limit_removed"] = originais - postadas
 
-        # 6) Minimizar o último slot usado
-        latest = self.model.NewIntVar(0, self.total_slots - 1, "latest_slot")
-        self.model.AddMaxEquality(
-            latest, [var for var in self.exam_slot.values()]
-        )
+        # 5) Sincronização da mesma disciplina entre cursos: já garantida
+        #    pela variável compartilhada do passo 1
+
+        # 6) Minimizar o último slot usado, a partir do limite inferior:
+        #    latest_slot = max(exames, piso), então uma solução que atinge
+        #    o limite já é ótima e a busca para ali
+        piso = max(self.lower_bound, self.horizon_floor)
+        latest = self.model.NewIntVar(piso, self.horizon - 1, "latest_slot")
+        self.model.AddMaxEquality(latest, self.class_vars + [piso])
         self.model.Minimize(latest)
+        self.latest = latest
 
-    def _solve(self):
+        # 7) Warm start: sugestões do agendamento anterior e exames fixados
+        self._add_hints()
+
+        # 8) Estratégia de busca opcional: latest_slot primeiro (menor
+        #    valor), depois os exames com menor domínio
+        if self.profile.search_strategy != "auto":
+            self.model.AddDecisionStrategy(
+                [latest],
+                cp_model.CHOOSE_FIRST,
+                cp_model.SELECT_MIN_VALUE,
+            )
+            self.model.AddDecisionStrategy(
+                self.class_vars,
+                cp_model.CHOOSE_MIN_DOMAIN_SIZE,
+                cp_model.SELECT_MIN_VALUE,
+            )
+
+    def _add_day_channel(self, nome: str, mask: int, var: cp_model.IntVar) -> List[cp_model.IntVar]:
+        # dia = slot // slots_per_day, com domínio restrito aos dias que têm
+        # algum slot do domínio; b[d] <=> dia == d via AddMapDomain.
+        # O(dias) por exame, contra O(dias × total_slots) das tabelas
+        dias_livres = sorted({s // self.slots_per_day for s in self._domain(mask)})
+        dia = self.model.NewIntVarFromDomain(
+            cp_model.Domain.FromValues(dias_livres), f"dia_{nome}"
+        )
+        self.model.AddDivisionEquality(dia, var, self.slots_per_day)
+
+        bools = [
+            self.model.NewBoolVar(f"b_{nome}_{dia_idx}")
+            for dia_idx in range(len(self.daily_slot_ranges))
+        ]
+        self.model.AddMapDomain(dia, bools)
+        return bools
+
+    def _add_day_tables(self, nome: str, var: cp_model.IntVar) -> List[cp_model.IntVar]:
+        # Codificação original (day_encoding="table"): uma tabela por
+        # (exame, dia) com total_slots tuplas, O(dias × total_slots) por exame
+        bools = []
+        for dia_idx, slot_range in enumerate(self.daily_slot_ranges):
+            b = self.model.NewBoolVar(f"b_{nome}_{dia_idx}")
+            # b=1 se var ∈ slot_range, senao 0
+            allowed = [(k, 1) for k in slot_range] + [
+                (k, 0)
+                for k in range(self.total_slots)
+                if k not in slot_range
+            ]
+            self.model.AddAllowedAssignments([var, b], allowed)
+            bools.append(b)
+        return bools
+
+    def model_stats(self) -> Dict[str, int]:
+        """
+        Retorna o tamanho do modelo construído: variáveis, restrições e
+        total de tuplas em restrições de tabela.
+        """
+        proto = self.model.Proto()
+        tuples = 0
+        for ct in proto.constraints:
+            # Acessar ct.table em uma restrição que não é tabela a
+            # transformaria em tabela vazia no proto nativo (OR-Tools >= 9.13)
+            if not _is_table(ct):
+                continue
+            # versões recentes do OR-Tools usam 'exprs' em vez de 'vars'
+            aridade = len(ct.table.exprs) or len(ct.table.vars)
+            if aridade:
+                tuples += len(ct.table.values) // aridade
+        return {
+            "variables": len(proto.variables),
+            "constraints": len(proto.constraints),
+            "tuples": tuples,
+        }
+
+    def _class_hint(self, idx: int) -> int:
+        # Slot sugerido para a classe (total_slots se não houver)
+        slot = self.hint_slots.get(self.sync[idx][0][0])
+        return self.total_slots if slot is None else slot
+
+    def _add_hints(self):
+        # hint_schedule (ou a solução gulosa) vira sugestão via AddHint, uma
+        # por variável: a do primeiro exame da classe com slot ainda
+        # possível. Os exames em fixed_exams ficam fixados nesse slot
+        hinted = 0
+        sugeridos = []
+        for (membros, mask), var in zip(self.sync, self.class_vars):
+            sugerido = None
+            for exame in membros:
+                slot = self.hint_slots.get(exame)
+                if slot is None or slot >= self.horizon or not mask >> slot & 1:
+                    continue
+                if sugerido is None:
+                    sugerido = slot
+                    self.model.AddHint(var, slot)
+                    sugeridos.append(slot)
+                hinted += 1
+                if exame in self.fixed_exams:
+                    self.model.Add(var == slot)
+        if hinted and hinted == len(self.exam_slot):
+            self.model.AddHint(self.latest, max(*sugeridos, self.lower_bound, self.horizon_floor))
+        self.preprocess_report["hinted_exams"] = hinted
+
+    def _configure_solver(self, max_time: Optional[float] = None) -> cp_model.CpSolver:
         solver = cp_model.CpSolver()
-        solver.parameters.max_time_in_seconds = 10
-        status = solver.Solve(self.model)
+        params = solver.parameters
+        params.max_time_in_seconds = max_time or self.profile.max_time_in_seconds
+        params.relative_gap_limit = self.profile.relative_gap_limit
+        if self.profile.num_workers:
+            params.num_workers = self.profile.num_workers
+        if self.profile.search_strategy == "fixed":
+            params.search_branching = cp_model.FIXED_SEARCH
+        return solver
+
+    def _run_cpsat(self, max_time: Optional[float] = None) -> Tuple[int, cp_model.CpSolver]:
+        solver = self._configure_solver(max_time)
+        callback = None
+        if self.tracer.enabled:
+            solver.parameters.log_search_progress = True
+            solver.parameters.log_to_stdout = False
+            solver.log_callback = lambda linha: self.tracer.event("cpsat_log", line=linha)
+            callback = _SolutionEvents(self.tracer)
+        with self.tracer.phase("solve"):
+            status = solver.Solve(self.model, callback)
+        self.solve_report = {
+            "status": solver.StatusName(status),
+            "objective": None,
+            "bound": solver.BestObjectiveBound(),
+            "wall_time": solver.WallTime(),
+            "engine": "cpsat",
+            "proof": None,
+        }
+        return status, solver
+
+    def _solve_horizons(self) -> Tuple[int, cp_model.CpSolver]:
+        # profile.horizon_search: resolve só com os dias até o do limite
+        # inferior e dobra o horizonte enquanto for inviável (até o último
+        # dia da solução gulosa, que sabidamente cabe); o fim do horizonte
+        # inviável vira o mínimo de latest_slot. O modelo cortado restringe
+        # o original, então o ótimo no horizonte é o global
+        spd = self.slots_per_day
+        n_dias = len(self.daily_slot_ranges)
+        fixos = [self.hint_slots[e] for e in self.fixed_exams if e in self.hint_slots]
+        # Todo exame tem slot livre até lower_bound (ver bounds.py), então
+        # nenhum domínio fica vazio no primeiro horizonte
+        dias = max([self.lower_bound, *fixos]) // spd + 1
+        teto = n_dias
+        if self.greedy_schedule is not None:
+            teto = min(n_dias, self.preprocess_report["greedy_latest"] // spd + 1)
+
+        prazo = time.perf_counter() + self.profile.max_time_in_seconds
+        self.horizon_floor = 0
+        tentativas: List[List[Any]] = []
+        gasto = 0.0
+        while True:
+            self.horizon = min(dias * spd, self.total_slots)
+            self._reset_model()
+            self._build()
+            status, solver = self._run_cpsat(max(prazo - time.perf_counter(), 0.01))
+            gasto += solver.WallTime()
+            tentativas.append([dias, solver.StatusName(status)])
+            self.tracer.event("horizon", days=dias, status=solver.StatusName(status))
+            if status != cp_model.INFEASIBLE or dias >= n_dias:
+                break
+            # Nenhuma solução termina antes do fim deste horizonte
+            self.horizon_floor = self.horizon
+            dias = min(2 * dias, teto if dias < teto else n_dias)
+        self.solve_report.update(wall_time=gasto, horizons=tentativas)
+        return status, solver
+
+    def _solve(self):
+        if self.profile.horizon_search:
+            status, solver = self._solve_horizons()
+        else:
+            status, solver = self._run_cpsat()
+        if status == cp_model.INFEASIBLE and self.fixed_exams:
+            # Fixar os exames inalterados tornou o modelo inviável:
+            # reconstrói mantendo apenas as sugestões
+            self.fixed_exams = set()
+            if self.greedy_schedule is None:
+                self._run_greedy()
+            self._reset_model()
+            self._build()
+            return self._solve()
+        if status == cp_model.UNKNOWN and self.greedy_schedule is not None:
+            # Sem solução no tempo do perfil: fica com a da heurística, que
+            # também respeita os exames fixados
+            self._use_greedy(wall_time=solver.WallTime(), bound=solver.BestObjectiveBound())
+            return
         if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
             raise RuntimeError("Nenhuma solução viável encontrada")
+        self.solve_report["objective"] = solver.ObjectiveValue()
+        self.solve_report["proof"] = self._proof(self.solve_report)
+        self.tracer.event("solve_report", **self.solve_report)
 
-        # 7) Montar self.exam_schedule: para cada curso, lista de listas (por slot)
+        # 9) Montar self.exam_schedule: para cada curso, lista de listas (por slot)
         schedule = {curso: [[] for _ in range(self.total_slots)] for curso in self.schedules}
         for (curso, subj), var in self.exam_slot.items():
             slot = solver.Value(var)
@@ -106,5 +490,331 @@ class Scheduler:
 
         self.exam_schedule = schedule
 
+    def _use_greedy(self, wall_time: float, bound: float = 0.0):
+        if self.greedy_schedule is None:
+            raise RuntimeError("Nenhuma solução viável encontrada")
+        objetivo = float(max(self.preprocess_report["greedy_latest"], self.lower_bound))
+        bound = max(bound, float(self.lower_bound))
+        self.solve_report = {
+            "status": "OPTIMAL" if objetivo <= bound else "FEASIBLE",
+            "objective": objetivo,
+            "bound": bound,
+            "wall_time": wall_time,
+            "engine": "greedy",
+        }
+        self.solve_report["proof"] = self._proof(self.solve_report)
+        self.tracer.event("solve_report", **self.solve_report)
+        self.exam_schedule = self.greedy_schedule
+        # Sem modelo montado, nada foi postado nem sugerido ao CP-SAT
+        originais = len(self.subjects_by_student) * len(self.daily_slot_ranges)
+        for chave, valor in (
+            ("daily_limit_posted", 0),
+            ("daily_limit_removed", originais),
+            ("hinted_exams", 0),
+            ("symmetries_broken", 0),
+        ):
+            self.preprocess_report.setdefault(chave, valor)
+
+    def _proof(self, report: Dict[str, Any]) -> Optional[str]:
+        if report["status"] != "OPTIMAL":
+            return None
+        return "bound" if report["objective"] <= self.lower_bound else "search"
+
+    def find_components(self) -> List[List[Tuple[str, str]]]:
+        """
+        Particiona os exames (curso, disciplina) em componentes conexas:
+        exames de um mesmo perfil de aluno, ou a mesma disciplina em cursos
+        sincronizados (classes do passo 1), ficam na mesma componente.
+        """
+        uf = UnionFind(
+            (curso, subj)
+            for curso in self.schedules
+            for subj in sorted(self.subjects_by_course.get(curso, []))
+        )
+        for curso, perfis in self.student_profiles.items():
+            for perfil in perfis:
+                primeiro, *resto = sorted(perfil)
+                for subj in resto:
+                    uf.union((curso, primeiro), (curso, subj))
+        for membros, _ in self.sync:
+            for exame in membros[1:]:
+                uf.union(membros[0], exame)
+        return uf.groups()
+
+    def _component_tasks(self, indices: List[int]) -> List[Dict[str, Any]]:
+        # Distribui alunos e perfis entre as componentes numa única passada:
+        # as disciplinas de um aluno (ou perfil) estão todas na mesma
+        # componente, então basta olhar a primeira
+        componente = {exame: idx for idx in indices for exame in self.components[idx]}
+        alunos: Dict[int, Dict[Tuple[str, str], FrozenSet[str]]] = {idx: {} for idx in indices}
+        for (curso, aluno), subj_set in self.subjects_by_student.items():
+            idx = componente.get((curso, min(subj_set))) if subj_set else None
+            if idx is not None:
+                alunos[idx][(curso, aluno)] = subj_set
+        perfis: Dict[int, Dict[str, List[FrozenSet[str]]]] = {idx: {} for idx in indices}
+        for curso, lista in self.student_profiles.items():
+            for perfil in lista:
+                idx = componente.get((curso, min(perfil))) if perfil else None
+                if idx is not None:
+                    perfis[idx].setdefault(curso, []).append(perfil)
+        return [
+            self._component_kwargs(self.components[idx], alunos[idx], perfis[idx])
+            for idx in indices
+        ]
+
+    def _component_kwargs(
+        self,
+        exames: List[Tuple[str, str]],
+        alunos: Dict[Tuple[str, str], FrozenSet[str]],
+        perfis: Dict[str, List[FrozenSet[str]]],
+    ) -> Dict[str, Any]:
+        # Restringe os dados do Scheduler aos exames de uma componente
+        subjects_by_course: Dict[str, Set[str]] = {}
+        for curso, subj in exames:
+            subjects_by_course.setdefault(curso, set()).add(subj)
+        courses_by_subject: Dict[str, List[str]] = {}
+        for curso, subjs in subjects_by_course.items():
+            for subj in subjs:
+                courses_by_subject.setdefault(subj, []).append(curso)
+        return dict(
+            schedules={c: self.schedules[c] for c in subjects_by_course},
+            subjects_by_course=subjects_by_course,
+            subjects_by_student=alunos,
+            courses_by_subject=courses_by_subject,
+            free_slots={c: self.free_slots[c] for c in subjects_by_course},
+            daily_slot_ranges=self.daily_slot_ranges,
+            slots_per_day=self.slots_per_day,
+            total_slots=self.total_slots,
+            day_encoding=self.day_encoding,
+            profile=self.profile,
+            hint_schedule=self.hint_schedule,
+            fixed_exams=self.fixed_exams & set(exames),
+            lower_bound=self.lower_bound,
+            student_profiles={curso: perfis.get(curso, []) for curso in subjects_by_course},
+        )
+
+    def _domain(self, mask: int) -> List[int]:
+        # Slots do domínio (bitmask) dentro do horizonte atual
+        return mask_to_slots(mask & ((1 << self.horizon) - 1))
+
+    def _is_free(self, curso: str, slot: Optional[int]) -> bool:
+        return slot is not None and bool(self.free_slot_masks[curso] >> slot & 1)
+
+    def _is_pinned(self, exames: List[Tuple[str, str]]) -> bool:
+        # Todos os exames fixados em um slot ainda livre: nada a resolver
+        return all(
+            exame in self.fixed_exams
+            and self._is_free(exame[0], self.hint_slots.get(exame))
+            for exame in exames
+        )
+
+    def _pinned_component(
+        self, exames: List[Tuple[str, str]],
+    ) -> Tuple[Dict[str, List[List[str]]], Dict[str, Any], Dict[str, int]]:
+        schedule: Dict[str, List[List[str]]] = {}
+        for curso, subj in exames:
+            slots = schedule.setdefault(curso, [[] for _ in range(self.total_slots)])
+            slots[self.hint_slots[(curso, subj)]].append(subj)
+        # Nada foi resolvido: só o limite inferior vale como bound
+        latest = float(max(self.hint_slots[e] for e in exames))
+        report = {
+            "status": "FEASIBLE", "objective": latest, "bound": float(self.lower_bound),
+            "wall_time": 0.0, "engine": "pinned", "proof": None,
+        }
+        pre = {"daily_limit_posted": 0, "hinted_exams": len(exames)}
+        return schedule, report, pre
+
+    def _solve_decomposed(self):
+        # Cada componente conexa (ver find_components) vira um Scheduler
+        # próprio, resolvido num pool de processos (max_workers), e as
+        # soluções são recombinadas: o objetivo é um máximo, logo o ótimo
+        # global é o máximo dos ótimos. Componentes com todos os exames
+        # fixados não são resolvidas. O tempo do perfil é um prazo único
+        # para todas (como em _solve_horizons): cada componente resolve
+        # com o que ainda resta quando começa
+        self.components = self.find_components()
+        a_resolver = [
+            idx for idx, exames in enumerate(self.components)
+            if not self._is_pinned(exames)
+        ]
+        inicio = time.perf_counter()
+        # Relógio de parede: o prazo é comparado nos processos do pool
+        prazo = time.time() + self.profile.max_time_in_seconds
+        tarefas = self._component_tasks(a_resolver)
+
+        trace = [self.tracer.enabled] * len(tarefas)
+        prazos = [prazo] * len(tarefas)
+        if len(tarefas) <= 1 or self.max_workers == 1:
+            resolvidas = list(map(_solve_component, tarefas, trace, prazos))
+        else:
+            # Cada processo resolve com a sua fatia das threads do perfil
+            # (0 = todos os núcleos): sem isso seriam processos × núcleos
+            processos = min(len(tarefas), self.max_workers or os.cpu_count() or 1)
+            threads = max(1, (self.profile.num_workers or os.cpu_count() or 1) // processos)
+            for kw in tarefas:
+                kw["profile"] = replace(self.profile, num_workers=threads)
+            with ProcessPoolExecutor(max_workers=processos) as pool:
+                resolvidas = list(pool.map(_solve_component, tarefas, trace, prazos))
+
+        for idx, (_, _, _, records) in zip(a_resolver, resolvidas):
+            self.tracer.extend(records, component=idx)
+        resolvidas = [(sch, rep, pre) for sch, rep, pre, _ in resolvidas]
+
+        por_indice = dict(zip(a_resolver, resolvidas))
+        parciais = [
+            por_indice[idx] if idx in por_indice else self._pinned_component(exames)
+            for idx, exames in enumerate(self.components)
+        ]
+
+        schedule = {curso: [[] for _ in range(self.total_slots)] for curso in self.schedules}
+        for parcial, _, _ in parciais:
+            for curso, slots in parcial.items():
+                for slot, subjs in enumerate(slots):
+                    schedule[curso][slot].extend(subjs)
+
+        # Objetivo global = máximo das componentes, e o bound de qualquer
+        # componente (ou o limite global) também vale para ele: é OPTIMAL
+        # quando o máximo dos objetivos alcança o maior bound
+        reports = [report for _, report, _ in parciais]
+        objetivo = max((r["objective"] for r in reports), default=0.0)
+        bound = max([float(self.lower_bound)] + [r["bound"] for r in reports])
+        self.solve_report = {
+            "status": "OPTIMAL" if objetivo <= bound else "FEASIBLE",
+            "objective": objetivo,
+            "bound": bound,
+            "wall_time": time.perf_counter() - inicio,
+            # "cpsat+greedy" se alguma componente caiu na heurística, "+pinned"
+            # se alguma tinha todos os exames fixados
+            "engine": "+".join(sorted({r["engine"] for r in reports})) or self.profile.engine,
+        }
+        self.solve_report["proof"] = self._proof(self.solve_report)
+        postadas = sum(pre.get("daily_limit_posted", 0) for _, _, pre in parciais)
+        originais = len(self.subjects_by_student) * len(self.daily_slot_ranges)
+        self.preprocess_report.update(
+            daily_limit_posted=postadas,
+            daily_limit_removed=originais - postadas,
+            hinted_exams=sum(pre.get("hinted_exams", 0) for _, _, pre in parciais),
+            symmetries_broken=sum(pre.get("symmetries_broken", 0) for _, _, pre in parciais),
+            components=len(self.components),
+            components_solved=len(a_resolver),
+        )
+        self.exam_schedule = schedule
+
+    def reschedule(
+        self, diff: ScheduleDiff,
+    ) -> Tuple[Dict[str, List[List[str]]], List[Tuple[str, str, int, int]]]:
+        """
+        Reagenda após uma edição pontual (alunos adicionados, removidos ou
+        com disciplinas alteradas, inclusive por mudança de exames em aula).
+
+        Exames cujo conjunto de alunos não mudou ficam fixados no slot
+        atual; só as componentes que contêm algum exame afetado são
+        reconstruídas e resolvidas. O Scheduler passa a refletir os dados
+        atualizados. Retorna (novo exam_schedule, exames que mudaram de
+        slot como (curso, disciplina, slot_antigo, slot_novo)).
+        """
+        subjects_by_student = diff.apply(self.subjects_by_student)
+        subjects_by_course: Dict[str, Set[str]] = {curso: set() for curso in self.schedules}
+        for (curso, aluno), subj_set in subjects_by_student.items():
+            subjects_by_course[curso] |= subj_set
+        courses_by_subject: Dict[str, List[str]] = {}
+        for curso, subj_set in subjects_by_course.items():
+            for subj in subj_set:
+                courses_by_subject.setdefault(subj, []).append(curso)
+
+        antes = students_by_exam(self.subjects_by_student)
+        depois = students_by_exam(subjects_by_student)
+        slots_antes = slot_by_exam(self.exam_schedule)
+        inalterados = {
+            (curso, subj)
+            for (curso, subj) in slots_antes
+            if depois.get(curso, {}).get(subj) == antes.get(curso, {}).get(subj)
+        }
+
+        nxt = Scheduler(
+            schedules=self.schedules,
+            subjects_by_course=subjects_by_course,
+            subjects_by_student=subjects_by_student,
+            courses_by_subject=courses_by_subject,
+            free_slots=self.free_slots,
+            daily_slot_ranges=self.daily_slot_ranges,
+            slots_per_day=self.slots_per_day,
+            total_slots=self.total_slots,
+            day_encoding=self.day_encoding,
+            decompose=True,
+            max_workers=self.max_workers,
+            profile=self.profile,
+            hint_schedule=self.exam_schedule,
+            fixed_exams=inalterados,
+        )
+
+        slots_depois = slot_by_exam(nxt.exam_schedule)
+        moved = [
+            (curso, subj, slot, slots_depois[(curso, subj)])
+            for (curso, subj), slot in sorted(slots_antes.items())
+            if (curso, subj) in slots_depois and slots_depois[(curso, subj)] != slot
+        ]
+
+        for attr in (
+            "subjects_by_student", "subjects_by_course", "courses_by_subject",
+            "student_profiles", "components", "exam_schedule",
+            "solve_report", "preprocess_report",
+        ):
+            setattr(self, attr, getattr(nxt, attr))
+        self._reset_model()
+        return self.exam_schedule, moved
+
+    def solve(self) -> Dict[str, List[List[str]]]:
+        """
+        Resolve o modelo. Chamado pelo construtor, exceto com solve=False
+        (útil para medir construção e busca separadamente).
+        """
+        if self.profile.engine == "greedy" and self.greedy_schedule is None and self.fixed_exams:
+            # Como no CP-SAT: se a fixação inviabiliza, ficam só as sugestões
+            self.fixed_exams = set()
+            self._run_greedy()
+        if self.profile.engine == "greedy" or self._greedy_is_optimal():
+            self._use_greedy(wall_time=self.greedy_seconds)
+        elif self.decompose:
+            self._solve_decomposed()
+        else:
+            self._solve()
+        return self.exam_schedule
+
     def get_exam_schedule(self) -> Dict[str, List[List[str]]]:
         return self.exam_schedule
+
+
+def _is_table(ct) -> bool:
+    if hasattr(ct, "has_table"):
+        return ct.has_table()
+    return ct.HasField("table")
+
+
+class _SolutionEvents(cp_model.CpSolverSolutionCallback):
+    # Emite um evento estruturado a cada solução melhorada pelo CP-SAT
+    def __init__(self, tracer: Tracer):
+        super().__init__()
+        self.tracer = tracer
+
+    def on_solution_callback(self):
+        self.tracer.event(
+            "solution",
+            objective=self.ObjectiveValue(),
+            bound=self.BestObjectiveBound(),
+            wall_time=self.WallTime(),
+        )
+
+
+def _solve_component(
+    kwargs: Dict[str, Any], trace: bool = False, prazo: Optional[float] = None,
+) -> Tuple[Dict[str, List[List[str]]], Dict[str, Any], Dict[str, int], List[Dict[str, Any]]]:
+    # Executado nos processos do pool: resolve uma componente isolada, com
+    # o tempo que resta até 'prazo' (time.time()). Os registros de
+    # instrumentação voltam em memória para o processo pai
+    if prazo is not None:
+        restante = max(prazo - time.time(), 0.01)
+        kwargs = dict(kwargs, profile=replace(kwargs["profile"], max_time_in_seconds=restante))
+    tracer = Tracer(track_memory=False) if trace else NULL_TRACER
+    sched = Scheduler(**kwargs, tracer=tracer)
+    return sched.get_exam_schedule(), sched.solve_report, sched.preprocess_report, tracer.records
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from src.disk_cache import JsonDiskCache
+from src.encoding import StudentTable, SubjectsByStudent, mask_to_slots
+
+# Incrementar quando o formato ou a derivação do DataLoader mudarem,
+# invalidando os snapshots existentes
+SNAPSHOT_VERSION = 1
+
+MAGIC = b"EXSNAP\x00\x01"
+_HEADER_LEN = struct.Struct("<Q")
+_ALIGN = 8
+
+# Arrays da StudentTable, gravados crus (tipo 'I', ordem de bytes nativa)
+_ARRAYS = ("student_course", "ptr", "subject_ids")
+
+# Atributos do DataLoader guardados no snapshot
+SNAPSHOT_FIELDS = (
+    "schedules", "days", "exams_in_class", "slots_per_day", "total_slots",
+    "student_table", "subjects_by_course", "courses_by_subject",
+    "class_exam_by_slot", "class_exam_conflicts", "free_slot_masks",
+    "daily_slot_ranges", "student_profiles",
+)
+
+
+class SnapshotCache(JsonDiskCache):
+    """
+    Snapshots binários de um DataLoader já derivado, um '<chave>.bin' por
+    conjunto de arquivos de entrada. A chave é o SHA-256 dos bytes dos
+    JSONs (mais SNAPSHOT_VERSION), então editar qualquer arquivo em
+    'dados/' gera um snapshot novo na próxima carga.
+
+    Formato: MAGIC, tamanho do cabeçalho, cabeçalho JSON (tabelas pequenas:
+    horários, dias, índices de disciplinas, perfis, slots livres) e, a
+    partir de um offset alinhado, os arrays CSR da StudentTable e os nomes
+    dos alunos. Na leitura o arquivo é mapeado em memória (mmap) e os
+    arrays viram memoryviews sobre o mapa, sem cópia.
+    """
+
+    suffix = ".bin"
+
+    @staticmethod
+    def key(base_path: Path, filenames: Iterable[str]) -> str:
+        h = hashlib.sha256(f"v{SNAPSHOT_VERSION}".encode())
+        for filename in filenames:
+            h.update(filename.encode())
+            h.update((base_path / filename).read_bytes())
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Devolve os atributos do DataLoader gravados no snapshot, ou None se
+        não houver snapshot válido para a chave.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            os.utime(path)  # marca como usado recentemente
+        except (FileNotFoundError, ValueError):  # ValueError: arquivo vazio
+            return None
+        try:
+            return _read(mm)
+        except (ValueError, KeyError, struct.error):
+            return None
+
+    def put(self, key: str, state: Dict[str, Any]):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                _write(f, state)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self._evict()
+
+
+SNAPSHOT_CACHE = SnapshotCache(
+    Path(__file__).parent.parent / ".cache" / "snapshots", max_entries=8
+)
+
+
+def _write(f, state: Dict[str, Any]):
+    table: StudentTable = state["student_table"]
+    blobs = [array("I", getattr(table, nome)).tobytes() for nome in _ARRAYS]
+    blobs.append("\0".join(table.student_names).encode("utf-8"))
+
+    header = {
+        "byteorder": sys.byteorder,
+        "itemsize": array("I").itemsize,
+        "schedules": state["schedules"],
+        "days": state["days"],
+        "exams_in_class": state["exams_in_class"],
+        "slots_per_day": state["slots_per_day"],
+        "total_slots": state["total_slots"],
+        "subjects_by_course": {c: sorted(s) for c, s in state["subjects_by_course"].items()},
+        "courses_by_subject": state["courses_by_subject"],
+        "class_exam_by_slot": state["class_exam_by_slot"],
+        "class_exam_conflicts": state["class_exam_conflicts"],
+        "free_slot_masks": state["free_slot_masks"],
+        "daily_slot_ranges": [[r.start, r.stop] for r in state["daily_slot_ranges"]],
+        "student_profiles": {
+            c: [sorted(p) for p in perfis] for c, perfis in state["student_profiles"].items()
+        },
+        "courses": table.courses,
+        "subjects": table.subjects,
+        "students": len(table),
+        "blobs": [],
+    }
+    # Os offsets dependem do tamanho do cabeçalho, que depende dos offsets:
+    # reserva largura fixa para eles e completa com espaços
+    header["blobs"] = [[10 ** 15, len(b)] for b in blobs]
+    tamanho = len(json.dumps(header, ensure_ascii=False).encode("utf-8"))
+    inicio = _align(len(MAGIC) + _HEADER_LEN.size + tamanho)
+    offset = inicio
+    for entrada, blob in zip(header["blobs"], blobs):
+        entrada[0] = offset
+        offset = _align(offset + len(blob))
+    dados = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    dados += b" " * (tamanho - len(dados))
+
+    f.write(MAGIC)
+    f.write(_HEADER_LEN.pack(len(dados)))
+    f.write(dados)
+    for (off, _), blob in zip(header["blobs"], blobs):
+        f.write(b"\0" * (off - f.tell()))
+        f.write(blob)
+
+
+def _read(mm: mmap.mmap) -> Dict[str, Any]:
+    if mm[:len(MAGIC)] != MAGIC:
+        raise ValueError("não é um snapshot")
+    (tamanho,) = _HEADER_LEN.unpack_from(mm, len(MAGIC))
+    inicio = len(MAGIC) + _HEADER_LEN.size
+    header = json.loads(mm[inicio:inicio + tamanho].decode("utf-8"))
+    if header["byteorder"] != sys.byteorder or header["itemsize"] != array("I").itemsize:
+        raise ValueError("snapshot gravado em outra plataforma")
+
+    view = memoryview(mm)
+    arrays = [view[off:off + n].cast("I") for off, n in header["blobs"][:len(_ARRAYS)]]
+    off, n = header["blobs"][len(_ARRAYS)]
+    nomes = bytes(view[off:off + n]).decode("utf-8").split("\0") if header["students"] else []
+
+    table = StudentTable.from_arrays(header["courses"], header["subjects"], nomes, *arrays)
+    free_slot_masks = header["free_slot_masks"]
+    return {
+        "schedules": header["schedules"],
+        "days": header["days"],
+        "exams_in_class": header["exams_in_class"],
+        "slots_per_day": header["slots_per_day"],
+        "total_slots": header["total_slots"],
+        "student_table": table,
+        "subjects_by_student": SubjectsByStudent(table),
+        "subjects_by_course": {c: set(s) for c, s in header["subjects_by_course"].items()},
+        "courses_by_subject": header["courses_by_subject"],
+        # JSON só tem chaves string: os slots voltam a ser int
+        "class_exam_by_slot": {
+            c: {int(slot): subj for slot, subj in slots.items()}
+            for c, slots in header["class_exam_by_slot"].items()
+        },
+        "class_exam_conflicts": [tuple(c) for c in header["class_exam_conflicts"]],
+        "free_slot_masks": free_slot_masks,
+        "free_slots": {c: mask_to_slots(m) for c, m in free_slot_masks.items()},
+        "daily_slot_ranges": [range(a, b) for a, b in header["daily_slot_ranges"]],
+        "student_profiles": {
+            c: [frozenset(p) for p in perfis] for c, perfis in header["student_profiles"].items()
+        },
+    }
+
+
+def _align(n: int) -> int:
+    return -(-n // _ALIGN) * _ALIGN
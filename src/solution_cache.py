@@ -0,0 +1,43 @@
+import hashlib
+import json
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional
+
+from src.data_loader import INPUT_FILES
+from src.disk_cache import JsonDiskCache
+from src.solver_profile import SolverProfile
+
+# Incrementar quando a formulação do modelo mudar, invalidando o cache
+CACHE_VERSION = 3
+
+CACHE_DIR = Path(__file__).parent.parent / ".cache" / "agendamentos"
+
+
+class SolutionCache(JsonDiskCache):
+    """
+    Cache em disco de exam_schedule endereçado por conteúdo: a chave é o
+    SHA-256 da forma canônica (JSON com chaves ordenadas) dos quatro
+    arquivos de entrada em 'dados/' mais os parâmetros do solver. Com
+    exames fixados, o agendamento de onde vêm as fixações (last_run)
+    também entra na chave.
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, max_entries: int = 32):
+        super().__init__(cache_dir, max_entries)
+
+    @staticmethod
+    def key(base_path: Path, profile: SolverProfile, last_run: Optional[Path] = None) -> str:
+        h = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+        for filename in INPUT_FILES:
+            data = json.loads((base_path / filename).read_text(encoding="utf-8"))
+            h.update(filename.encode())
+            h.update(
+                json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode()
+            )
+        h.update(json.dumps(asdict(profile), sort_keys=True).encode())
+        if last_run is not None:
+            h.update(b"fixados")
+            if last_run.exists():
+                h.update(last_run.read_bytes())
+        return h.hexdigest()
@@ -0,0 +1,70 @@
+from dataclasses import dataclass, replace
+from typing import Dict
+
+SEARCH_STRATEGIES = ("auto", "latest_first", "fixed")
+ENGINES = ("cpsat", "greedy")
+
+
+@dataclass(frozen=True)
+class SolverProfile:
+    """
+    Parâmetros do CP-SAT repassados por run_scheduling até o Scheduler:
+    - num_workers: threads de busca (0 = todos os núcleos)
+    - max_time_in_seconds: orçamento de tempo por modelo
+    - relative_gap_limit: para quando (obj - bound) / obj <= gap
+    - search_strategy:
+        "auto"         → busca padrão do CP-SAT
+        "latest_first" → estratégia de decisão em latest_slot (menor valor)
+                         e depois nos exames (menor domínio), usada como
+                         sugestão pelo portfólio do CP-SAT
+        "fixed"        → mesma estratégia, seguida à risca (FIXED_SEARCH)
+    - engine:
+        "cpsat"  → modelo CP-SAT, partindo da solução gulosa como sugestão
+        "greedy" → só a heurística gulosa (src/greedy.py), em milissegundos
+    - horizon_search: resolve primeiro só com os dias iniciais do
+      calendário e amplia o horizonte enquanto for inviável (ver
+      Scheduler._solve_horizons)
+    """
+
+    num_workers: int = 0
+    max_time_in_seconds: float = 10.0
+    relative_gap_limit: float = 0.0
+    search_strategy: str = "auto"
+    engine: str = "cpsat"
+    horizon_search: bool = False
+
+    def __post_init__(self):
+        if self.search_strategy not in SEARCH_STRATEGIES:
+            raise ValueError(f"search_strategy inválida: {self.search_strategy!r}")
+        if self.engine not in ENGINES:
+            raise ValueError(f"engine inválido: {self.engine!r}")
+        if self.num_workers < 0:
+            raise ValueError("num_workers deve ser >= 0")
+        if self.max_time_in_seconds <= 0:
+            raise ValueError("max_time_in_seconds deve ser > 0")
+        if not 0.0 <= self.relative_gap_limit < 1.0:
+            raise ValueError("relative_gap_limit deve estar em [0, 1)")
+
+    @classmethod
+    def preset(cls, name: str, **overrides) -> "SolverProfile":
+        """
+        Retorna um dos perfis nomeados ("instant", "fast", "balanced",
+        "optimal"), opcionalmente sobrescrevendo campos.
+        """
+        if name not in PRESETS:
+            raise ValueError(
+                f"Perfil desconhecido: {name!r} (opções: {', '.join(PRESETS)})"
+            )
+        return replace(PRESETS[name], **overrides)
+
+
+PRESETS: Dict[str, SolverProfile] = {
+    "instant": SolverProfile(engine="greedy"),
+    "fast": SolverProfile(
+        max_time_in_seconds=2.0,
+        relative_gap_limit=0.05,
+        search_strategy="latest_first",
+    ),
+    "balanced": SolverProfile(),
+    "optimal": SolverProfile(max_time_in_seconds=300.0),
+}
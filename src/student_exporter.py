@@ -0,0 +1,174 @@
+import csv
+import json
+import os
+import time
+import xlsxwriter
+from pathlib import Path
+from typing import AbstractSet, Dict, Iterator, List, Mapping, Tuple
+
+from src.excel_exporter import TIME_LABELS, sheet_names
+from src.instrumentation import NULL_TRACER, Tracer
+from src.warm_start import slot_by_exam
+
+STUDENT_FORMATS = ("xlsx", "csv", "json")
+STUDENT_FILE = "ProvasPorAluno"
+
+COLUMNS = ["Curso", "Aluno", "Dia", "Dia da semana", "Horário", "Disciplina"]
+# Colunas "Prova N" do cabeçalho do xlsx; alunos com mais provas seguem à direita
+MAX_EXAMS_COLUMNS = 8
+
+
+class StudentExporter:
+    """
+    Recebe:
+    - exam_schedule (lista de disciplinas agendadas por slot, por curso)
+    - subjects_by_student ((curso, aluno) → disciplinas com prova agendada)
+    - days / slots_per_day (para converter slot em dia e horário)
+    E grava o cronograma de provas de cada aluno em output_dir, num único
+    arquivo STUDENT_FILE.<fmt>:
+    - xlsx: uma aba por curso, uma linha por aluno e uma célula por prova
+      (constant_memory)
+    - csv: uma linha por prova, com o curso na primeira coluna
+    - json: curso → aluno → [{dia, dia_semana, horario, disciplina}]
+
+    O índice (curso, disciplina) → slot é montado uma vez a partir de
+    exam_schedule; as linhas são geradas aluno a aluno e escritas direto
+    no arquivo, sem montar a tabela inteira em memória.
+    """
+
+    def __init__(
+        self,
+        exam_schedule: Dict[str, List[List[str]]],
+        subjects_by_student: Mapping[Tuple[str, str], AbstractSet[str]],
+        days: List[str],
+        slots_per_day: int,
+        output_dir: Path = Path("planilhas"),
+        fmt: str = "xlsx",
+        tracer: Tracer = NULL_TRACER,
+    ):
+        if fmt not in STUDENT_FORMATS:
+            raise ValueError(f"Formato desconhecido: {fmt!r} (use {', '.join(STUDENT_FORMATS)})")
+        self.exam_schedule = exam_schedule
+        self.subjects_by_student = subjects_by_student
+        self.days = days
+        self.slots_per_day = slots_per_day
+        self.output_dir = Path(output_dir)
+        self.fmt = fmt
+        self.tracer = tracer
+        self.output_file = self.output_dir / f"{STUDENT_FILE}.{fmt}"
+        self.students_written = 0
+        self.rows_written = 0
+        self.seconds = 0.0
+
+        self._export()
+
+    def _export(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.slot_by_exam = slot_by_exam(self.exam_schedule)
+
+        inicio = time.perf_counter()
+        with self.tracer.phase("export.alunos"):
+            if self.fmt == "xlsx":
+                self._write_xlsx()
+            elif self.fmt == "csv":
+                self._write_csv()
+            else:
+                self._write_json()
+        self.seconds = time.perf_counter() - inicio
+        self.tracer.count("student_rows_written", self.rows_written)
+
+    def _students_by_course(self) -> Dict[str, List[Tuple[str, AbstractSet[str]]]]:
+        por_curso: Dict[str, List[Tuple[str, AbstractSet[str]]]] = {}
+        for (curso, aluno), subjs in self.subjects_by_student.items():
+            por_curso.setdefault(curso, []).append((aluno, subjs))
+        for alunos in por_curso.values():
+            alunos.sort(key=lambda a: a[0])
+        return por_curso
+
+    def _timetable(self, curso: str, subjs: AbstractSet[str]) -> List[Tuple[int, str]]:
+        # Disciplinas sem slot (ex.: sem solução para o curso) ficam de fora
+        provas = []
+        for subj in subjs:
+            slot = self.slot_by_exam.get((curso, subj))
+            if slot is not None:
+                provas.append((slot, subj))
+        provas.sort()
+        return provas
+
+    def _rows(self, curso: str, alunos: List[Tuple[str, AbstractSet[str]]]) -> Iterator[List]:
+        for aluno, subjs in alunos:
+            provas = self._timetable(curso, subjs)
+            if provas:
+                self.students_written += 1
+            for slot, subj in provas:
+                dia_idx, periodo_idx = divmod(slot, self.slots_per_day)
+                self.rows_written += 1
+                yield [
+                    curso,
+                    aluno,
+                    dia_idx + 1,
+                    self.days[dia_idx].capitalize(),
+                    _time_label(periodo_idx),
+                    subj,
+                ]
+
+    def _write_xlsx(self):
+        # Uma linha por aluno, uma célula por prova: a planilha é para
+        # leitura (e escreve ~5× menos células que o formato longo)
+        wb = xlsxwriter.Workbook(str(self.output_file), {"constant_memory": True})
+        hdr = wb.add_format({"bold": True, "border": 1, "bg_color": "#D9D9D9"})
+        por_curso = self._students_by_course()
+        abas = sheet_names(por_curso)
+        for curso, alunos in por_curso.items():
+            ws = wb.add_worksheet(abas[curso])
+            ws.set_column(0, 0, 22)
+            ws.set_column(1, MAX_EXAMS_COLUMNS, 36)
+            ws.write_string(0, 0, "Aluno", hdr)
+            for col in range(1, MAX_EXAMS_COLUMNS + 1):
+                ws.write_string(0, col, f"Prova {col}", hdr)
+
+            row = 1
+            for aluno in alunos:
+                provas = list(self._rows(curso, [aluno]))
+                if not provas:
+                    continue
+                ws.write_string(row, 0, aluno[0])
+                for col, (_, _, dia, dia_semana, horario, subj) in enumerate(provas, start=1):
+                    ws.write_string(row, col, f"Dia {dia} ({dia_semana}) {horario} – {subj}")
+                row += 1
+        wb.close()
+
+    def _write_csv(self):
+        with open(self.output_file, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            for curso, alunos in self._students_by_course().items():
+                writer.writerows(self._rows(curso, alunos))
+
+    def _write_json(self):
+        # Escreve curso a curso e aluno a aluno para não materializar o
+        # documento inteiro antes do json.dumps
+        with open(self.output_file, "w", encoding="utf-8") as f:
+            f.write("{")
+            for i, (curso, alunos) in enumerate(self._students_by_course().items()):
+                f.write(("," if i else "") + f"\n{json.dumps(curso, ensure_ascii=False)}: {{")
+                primeiro = True
+                for aluno in alunos:
+                    provas = [
+                        {"dia": dia, "dia_semana": dia_semana, "horario": horario, "disciplina": subj}
+                        for _, _, dia, dia_semana, horario, subj in self._rows(curso, [aluno])
+                    ]
+                    if not provas:
+                        continue
+                    f.write(("" if primeiro else ",") + f"\n  {json.dumps(aluno[0], ensure_ascii=False)}: ")
+                    f.write(json.dumps(provas, ensure_ascii=False))
+                    primeiro = False
+                f.write("\n}")
+            f.write("\n}\n")
+
+
+def _time_label(periodo_idx: int) -> str:
+    # Há TIME_LABELS para 8 períodos; além disso, o número do período
+    if periodo_idx < len(TIME_LABELS):
+        return TIME_LABELS[periodo_idx]
+    return f"Período {periodo_idx + 1}"
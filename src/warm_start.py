@@ -0,0 +1,79 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+LAST_RUN_FILE = "UltimoAgendamento.json"
+
+
+def students_by_exam(
+    subjects_by_student: Dict[Tuple[str, str], Set[str]],
+) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Inverte subjects_by_student: curso → disciplina → alunos (ordenados).
+    Serve de assinatura para saber se um exame mudou entre execuções.
+    """
+    result: Dict[str, Dict[str, List[str]]] = {}
+    for (curso, aluno), subj_set in subjects_by_student.items():
+        for subj in subj_set:
+            result.setdefault(curso, {}).setdefault(subj, []).append(aluno)
+    for por_disc in result.values():
+        for alunos in por_disc.values():
+            alunos.sort()
+    return result
+
+
+def save_last_run(
+    path: Path,
+    exam_schedule: Dict[str, List[List[str]]],
+    subjects_by_student: Dict[Tuple[str, str], Set[str]],
+):
+    """
+    Persiste o exam_schedule resolvido junto com os alunos de cada exame,
+    para ser usado como warm start na próxima execução.
+    """
+    data = {
+        "exam_schedule": exam_schedule,
+        "alunos_por_exame": students_by_exam(subjects_by_student),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=4), encoding="utf-8")
+
+
+def load_last_run(path: Path) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def slot_by_exam(exam_schedule: Dict[str, List[List[str]]]) -> Dict[Tuple[str, str], int]:
+    """
+    Converte exam_schedule (lista de disciplinas por slot) em
+    (curso, disciplina) → slot.
+    """
+    return {
+        (curso, subj): slot
+        for curso, slots in exam_schedule.items()
+        for slot, subjs in enumerate(slots)
+        for subj in subjs
+    }
+
+
+def unchanged_exams(
+    last_run: Dict[str, Any],
+    subjects_by_student: Dict[Tuple[str, str], Set[str]],
+    free_slots: Dict[str, List[int]],
+) -> Set[Tuple[str, str]]:
+    """
+    Exames cujo conjunto de alunos não mudou desde last_run e cujo slot
+    anterior continua livre para o curso: podem ser fixados no lugar.
+    """
+    anteriores = last_run.get("alunos_por_exame", {})
+    atuais = students_by_exam(subjects_by_student)
+    fixos: Set[Tuple[str, str]] = set()
+    for (curso, subj), slot in slot_by_exam(last_run["exam_schedule"]).items():
+        alunos = atuais.get(curso, {}).get(subj)
+        if alunos is None or alunos != anteriores.get(curso, {}).get(subj):
+            continue
+        if slot in free_slots.get(curso, []):
+            fixos.add((curso, subj))
+    return fixos